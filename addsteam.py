@@ -11,7 +11,16 @@ import os
 import json
 from streamlit_elements import elements, mui, nivo
 import time
-import re  # 텍스트 전처리를 위한 정규 표현식 모듈 추가
+from db_pool import ConnectionPool
+from tag_index import TagInvertedIndex, TagDictionary, TagQuery
+from keyword_agg import KeywordMatrix, REVIEW_KEY_COLUMNS, classify_reviews, take_title_parts, title_frame, filter_by_keywords, keyword_summary_sql, keyword_summary_columns
+from review_schema import ReviewSchemaRegistry
+from review_stream import read_reviews
+from keyword_summary import KeywordSummaryStore
+from tag_combo_cache import TagCombinationStore, TagCombinationWarmer, top_tag_combinations
+from tiered_cache import TieredCache
+from shared_results import SharedTitleStore
+from similarity import NeighborStore, CosineSimilarityEngine, BackgroundEngine, BackgroundIVFIndex, RecommendationPrefetcher, MATRIX_NEIGHBORS
 
 # .env 파일 로드 (로컬에서만)
 if os.path.exists(".env"):
@@ -45,269 +54,550 @@ def get_db_connection():
         st.error(f"데이터베이스 연결 오류: {err.errno} - {err.msg}")
         return None
 
+# 프로세스 전역 커넥션 풀 (모든 세션이 공유)
+@st.cache_resource
+def get_db_pool():
+    return ConnectionPool(
+        get_db_connection,
+        size=int(os.getenv("DB_POOL_SIZE", 5)),
+        recycle=int(os.getenv("DB_POOL_RECYCLE", 300)),
+        timeout=int(os.getenv("DB_POOL_TIMEOUT", 10))
+    )
+
+db_pool = get_db_pool()
+
+# fetch_* 로더 결과용 메모리 + SQLite 디스크 2단 캐시 (메모리 단은 바이트 예산 안에서 LRU / LFU 로 제거, 재시작 후에는 디스크 단에서 바로 응답)
+@st.cache_resource
+def get_loader_cache():
+    return TieredCache(
+        os.getenv("LOADER_CACHE_PATH", os.path.join(".cache", "loaders.sqlite")),
+        memory_entries=int(os.getenv("LOADER_CACHE_ENTRIES", 256)),
+        memory_bytes=int(os.getenv("LOADER_CACHE_MEMORY_MB", 256)) * 1024 * 1024,
+        disk_bytes=int(os.getenv("LOADER_CACHE_DISK_MB", 512)) * 1024 * 1024,
+        ttl=int(os.getenv("LOADER_CACHE_TTL", 86400)),
+        policy=os.getenv("LOADER_CACHE_POLICY", "lru")
+    )
+
+loader_cache = get_loader_cache()
+
+# 로더 캐시 키 버전: REVIEW_TAG 스키마 지문 + 집계 테이블에 반영된 마지막 리뷰 id
+def loader_cache_version():
+    schema = get_review_schema()
+    schema.get_categories()
+    return f"{schema.fingerprint}:{get_keyword_summary().sync().high_water}"
+
+# 프로세스 공용 TAGS 사전 (앱 시작 시 읽고 TAGS_REFRESH 초마다 다시 읽음)
+@st.cache_resource(ttl=int(os.getenv("TAGS_REFRESH", 600)))
+def get_tag_dictionary():
+    with db_pool.connection() as connection:
+        if not connection:
+            raise ConnectionError("TAGS 사전을 읽을 수 없습니다.")
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT tag_id, tag_name FROM TAGS")
+            return TagDictionary(cursor.fetchall())
+        finally:
+            cursor.close()
+
+# user_tags(JSON 배열) -> 태그 이름 목록
+def map_tags(tag_json, tag_dictionary):
+    try:
+        tag_ids = json.loads(tag_json) if isinstance(tag_json, str) else tag_json
+        return tag_dictionary.names_of(tag_ids).tolist()
+    except (TypeError, ValueError):
+        return []
+
+# 여러 게임의 SIMILAR_GAMES 행을 한 번의 IN 쿼리로 읽기 -> {game_app_id: [행, ...]}
+def load_similar_games_batch(game_app_ids):
+    with db_pool.connection() as connection:
+        if not connection:
+            raise ConnectionError("SIMILAR_GAMES 테이블을 읽을 수 없습니다.")
+        cursor = connection.cursor(dictionary=True)
+        try:
+            placeholders = ','.join(['%s'] * len(game_app_ids))
+            query = f"""
+            SELECT game_app_id, recommended_app_id, recommended_title, user_tags
+            FROM SIMILAR_GAMES
+            WHERE game_app_id IN ({placeholders})
+            """
+            cursor.execute(query, [int(app_id) for app_id in game_app_ids])
+            rows_by_app = {}
+            for row in cursor.fetchall():
+                rows_by_app.setdefault(int(row.pop("game_app_id")), []).append(row)
+            return rows_by_app
+        finally:
+            cursor.close()
+
+# 태그 선택 결과의 추천 행을 백그라운드에서 미리 읽어 두는 프로세스 공용 저장소 (PREFETCH_TTL 초가 지난 행은 다시 읽음)
+@st.cache_resource
+def get_recommendation_prefetcher():
+    return RecommendationPrefetcher(load_similar_games_batch, ttl=int(os.getenv("PREFETCH_TTL", 600)))
+
 # SIMILAR_GAMES 데이터베이스 연결 함수
-@st.cache_data
+@loader_cache.cached(version=loader_cache_version, cacheable=lambda df: not df.empty)
 def fetch_similar_games(game_app_id):
-    connection = get_db_connection()
-    if not connection:
-        return pd.DataFrame()
     try:
-        cursor = connection.cursor(dictionary=True)
-        query = """
-        SELECT recommended_app_id, recommended_title, user_tags
-        FROM SIMILAR_GAMES
-        WHERE game_app_id = %s
-        """
-        cursor.execute(query, (game_app_id,))
-        results = cursor.fetchall()
-
-        cursor.execute("SELECT tag_id, tag_name FROM TAGS")
-        tag_results = cursor.fetchall()
-        tag_id_to_name = {tag['tag_id']: tag['tag_name'] for tag in tag_results}
-
-        if results:
-            df = pd.DataFrame(results)
-            def map_tags(tag_json):
-                try:
-                    tag_ids = json.loads(tag_json) if isinstance(tag_json, str) else tag_json
-                    return [tag_id_to_name.get(int(tid), str(tid)) for tid in tag_ids]
-                except:
-                    return []
-            df["tags"] = df["user_tags"].apply(map_tags)
-            df["link"] = df["recommended_app_id"].apply(lambda x: f"https://store.steampowered.com/app/{x}")
-            df["recommended_app_id"] = df["recommended_app_id"].astype("int64")
-            df = df.drop_duplicates(subset=["recommended_app_id"], keep="first")
-            return df[["recommended_title", "recommended_app_id", "tags", "link"]]
-        return pd.DataFrame(columns=["recommended_title", "recommended_app_id", "tags", "link"])
-    except mysql.connector.Error as err:
-        st.error(f"추천 게임 조회 오류: {err}")
+        tag_dictionary = get_tag_dictionary()
+        tag_index = get_tag_index()
+    except (ConnectionError, mysql.connector.Error) as err:
+        st.error(f"태그 조회 오류: {err}")
         return pd.DataFrame()
-    finally:
-        cursor.close()
-        connection.close()
+
+    # 미리 읽어 둔 행이 있으면 쓰고 (읽는 중이면 잠시 기다림), 없을 때만 직접 조회
+    results = get_recommendation_prefetcher().get(game_app_id, timeout=float(os.getenv("PREFETCH_WAIT", 2)))
+    if results is None:
+        try:
+            results = load_similar_games_batch([game_app_id]).get(int(game_app_id), [])
+        except (ConnectionError, mysql.connector.Error) as err:
+            st.error(f"추천 게임 조회 오류: {err}")
+            return pd.DataFrame()
+
+    if results:
+        df = pd.DataFrame(results)
+        # 추천 타이틀 태그는 미리 파싱해 둔 TITLELIST 태그 저장소에서 꺼내고, 목록에 없는 타이틀만 JSON 을 파싱
+        catalog_tags = tag_index.tag_lists(pd.to_numeric(df["recommended_app_id"]), tag_dictionary)
+        df["tags"] = [
+            tags if tags is not None else map_tags(tag_json, tag_dictionary)
+            for tags, tag_json in zip(catalog_tags, df["user_tags"])
+        ]
+        df["link"] = df["recommended_app_id"].apply(lambda x: f"https://store.steampowered.com/app/{x}")
+        df["recommended_app_id"] = df["recommended_app_id"].astype("int64")
+        df = df.drop_duplicates(subset=["recommended_app_id"], keep="first")
+        return df[["recommended_title", "recommended_app_id", "tags", "link"]]
+    return pd.DataFrame(columns=["recommended_title", "recommended_app_id", "tags", "link"])
+
+# MATRIX 테이블 전체를 이웃 배열로 읽어 둔 저장소 (MATRIX_REFRESH 초마다 다시 읽음)
+@st.cache_resource(ttl=int(os.getenv("MATRIX_REFRESH", 3600)))
+def get_neighbor_store():
+    columns = ", ".join(
+        [f"recommended_app_id_{i}" for i in range(1, MATRIX_NEIGHBORS + 1)]
+        + [f"similarity_{i}" for i in range(1, MATRIX_NEIGHBORS + 1)]
+    )
+    with db_pool.connection() as connection:
+        if not connection:
+            raise ConnectionError("MATRIX 테이블을 읽을 수 없습니다.")
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"SELECT game_app_id, {columns} FROM MATRIX")
+            return NeighborStore.from_rows(cursor.fetchall())
+        finally:
+            cursor.close()
 
 # MATRIX 테이블에서 코사인 유사도 데이터 가져오기
-@st.cache_data
 def fetch_matrix_similar_games(game_app_id):
-    connection = get_db_connection()
-    if not connection:
-        return pd.DataFrame()
     try:
-        cursor = connection.cursor(dictionary=True)
-        query = """
-        SELECT name, game_app_id,
-               recommended_app_id_1, recommended_title_1, similarity_1,
-               recommended_app_id_2, recommended_title_2, similarity_2,
-               recommended_app_id_3, recommended_title_3, similarity_3,
-               recommended_app_id_4, recommended_title_4, similarity_4,
-               recommended_app_id_5, recommended_title_5, similarity_5,
-               recommended_app_id_6, recommended_title_6, similarity_6,
-               recommended_app_id_7, recommended_title_7, similarity_7,
-               recommended_app_id_8, recommended_title_8, similarity_8,
-               recommended_app_id_9, recommended_title_9, similarity_9
-        FROM MATRIX
-        WHERE game_app_id = %s
-        """
-        cursor.execute(query, (game_app_id,))
-        results = cursor.fetchall()
-
-        if results:
-            df = pd.DataFrame(results)
-            similar_games = []
-            for i in range(1, 10):
-                col_app_id = f"recommended_app_id_{i}"
-                col_title = f"recommended_title_{i}"
-                col_sim = f"similarity_{i}"
-                if col_app_id in df.columns and col_sim in df.columns:
-                    temp_df = df[[col_app_id, col_title, col_sim]].dropna()
-                    temp_df.columns = ["recommended_app_id", "recommended_title", "similarity"]
-                    temp_df["recommended_app_id"] = pd.to_numeric(temp_df["recommended_app_id"], errors='coerce').astype("int64")
-                    temp_df["similarity"] = temp_df["similarity"] * 100  # 백분율로 변환
-                    similar_games.append(temp_df)
-            if similar_games:
-                similar_games_df = pd.concat(similar_games, ignore_index=True)
-                similar_games_df = similar_games_df.sort_values("similarity", ascending=False).drop_duplicates(subset=["recommended_app_id"], keep="first")
-                return similar_games_df[["recommended_app_id", "similarity"]]
-        return pd.DataFrame(columns=["recommended_app_id", "similarity"])
-    except mysql.connector.Error as err:
+        neighbor_store = get_neighbor_store()
+    except (ConnectionError, mysql.connector.Error) as err:
         st.error(f"MATRIX 테이블 조회 오류: {err}")
-        return pd.DataFrame()
-    finally:
-        cursor.close()
-        connection.close()
-
-# 캐싱된 태그 목록 가져오기
-@st.cache_data
+        return pd.DataFrame(columns=["recommended_app_id", "similarity"])
+    similar_games_df = neighbor_store.top_k(game_app_id)
+    similar_games_df["similarity"] = similar_games_df["similarity"].astype(float) * 100  # 백분율로 변환
+    return similar_games_df
+
+# 코사인 유사도 엔진 생성 (TITLELIST 태그 + REVIEW_TAG 키워드 프로필)
+# 키워드 프로필은 요약 테이블이 준비되어 있으면 그대로 읽고, 없을 때만 REVIEW_TAG 전체 GROUP BY 집계를 실행
+# 백그라운드 스레드에서 실행하므로 st 호출 없이 오류는 예외로 올린다
+def load_similarity_engine():
+    tag_index = get_tag_index()
+    categories = get_review_schema().get_categories()
+    keyword_summary = get_keyword_summary()
+    with db_pool.connection() as connection:
+        if not connection:
+            raise ConnectionError("리뷰 키워드 프로필을 읽을 수 없습니다.")
+        try:
+            summary_df = keyword_summary.read(connection, None, categories)
+        except mysql.connector.Error:
+            summary_df = None
+        if summary_df is None:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(keyword_summary_sql(categories))
+                summary_df = pd.DataFrame(cursor.fetchall(), columns=keyword_summary_columns(categories))
+            finally:
+                cursor.close()
+    keyword_matrix = KeywordMatrix.from_summary(tag_index.app_ids, summary_df, categories)
+    return CosineSimilarityEngine(tag_index.app_ids, tag_index.tag_offsets, tag_index.tag_flat, keyword_matrix)
+
+# 유사도 엔진을 백그라운드에서 만들어 두는 프로세스 공용 자리 (SIMILARITY_REFRESH 초마다 다시 생성)
+@st.cache_resource(ttl=int(os.getenv("SIMILARITY_REFRESH", 3600)))
+def get_similarity_engine_loader():
+    return BackgroundEngine(load_similarity_engine).start()
+
+# 준비된 유사도 엔진 (SIMILARITY_WAIT 초까지 기다려도 준비 중이면 None, 생성에 실패했으면 다음 호출에서 다시 만들도록 비우고 예외)
+def get_similarity_engine():
+    loader = get_similarity_engine_loader()
+    engine = loader.get(timeout=float(os.getenv("SIMILARITY_WAIT", 2)))
+    if engine is None and loader.last_error is not None:
+        get_similarity_engine_loader.clear()
+        raise loader.last_error
+    return engine
+
+# 이 타이틀 수보다 작은 카탈로그는 전수 계산이 근사 검색보다 빠르므로 색인을 만들지 않는다
+ANN_MIN_TITLES = int(os.getenv("ANN_MIN_TITLES", 50000))
+
+# 유사도 엔진 위의 IVF 근사 최근접 이웃 색인 (카탈로그가 ANN_MIN_TITLES 이상일 때만)
+# ANN_INDEX_PATH 에 저장된 색인이 현재 엔진 데이터와 같으면 불러오고, 아니면 백그라운드에서 새로 만들어 재현율을 측정한 뒤 저장
+@st.cache_resource(ttl=int(os.getenv("SIMILARITY_REFRESH", 3600)))
+def get_ann_index():
+    engine = get_similarity_engine()
+    if engine is None:
+        raise ConnectionError("유사도 엔진을 준비하는 중입니다.")
+    if len(engine) < ANN_MIN_TITLES:
+        return None
+    return BackgroundIVFIndex(
+        engine,
+        os.getenv("ANN_INDEX_PATH", os.path.join(".cache", "ann_index.npz")),
+        nprobe=int(os.getenv("ANN_NPROBE", 16))
+    ).start()
+
+# 유사도 엔진으로 추천 게임 계산
+# 전체 카탈로그 대상은 근사 색인이 준비되어 있으면 그것으로, 아니면 (작은 카탈로그 / 색인 준비 중) 정확히 계산
+# required_tags 를 주면 그 태그를 모두 가진 게임 중에서 정확히 계산
+def compute_similar_games(game_app_id, k=10, required_tags=None):
+    columns = ["recommended_title", "recommended_app_id", "tags", "link", "similarity"]
+    try:
+        tag_index = get_tag_index()
+        tag_dictionary = get_tag_dictionary()
+        engine = get_similarity_engine()
+        if engine is None:
+            st.info("유사도 엔진을 준비하는 중입니다. 잠시 후 다시 시도해 주세요.")
+            return pd.DataFrame(columns=columns)
+        if required_tags:
+            candidates = tag_index.app_ids_with_all(tag_dictionary.ids_of(required_tags))
+            df = engine.top_k(game_app_id, k=k, candidates=candidates)
+        else:
+            ann_index = get_ann_index()
+            index = ann_index.get() if ann_index is not None else None
+            if index is not None:
+                df = index.top_k(game_app_id, k=k)
+            else:
+                df = engine.top_k(game_app_id, k=k)
+    except (ConnectionError, mysql.connector.Error) as err:
+        st.error(f"유사도 계산 오류: {err}")
+        return pd.DataFrame(columns=columns)
+    df["recommended_title"] = tag_index.rows(df["recommended_app_id"])["name"]
+    df["tags"] = tag_index.tag_lists(df["recommended_app_id"], tag_dictionary)
+    df["link"] = df["recommended_app_id"].apply(lambda x: f"https://store.steampowered.com/app/{x}")
+    df["similarity"] = df["similarity"].astype(float) * 100  # 백분율로 변환
+    return df[columns]
+
+# 기준 게임과 지정한 게임들 사이의 유사도 (백분율, 계산할 수 없으면 nan)
+def compute_similarity_between(game_app_id, other_app_ids):
+    try:
+        engine = get_similarity_engine()
+    except (ConnectionError, mysql.connector.Error) as err:
+        st.error(f"유사도 계산 오류: {err}")
+        return np.full(len(other_app_ids), np.nan)
+    if engine is None:
+        return np.full(len(other_app_ids), np.nan)
+    return engine.similarity_between(game_app_id, other_app_ids).astype(float) * 100
+
+# 태그 목록 가져오기 (공용 TAGS 사전)
 def fetch_all_tags():
-    connection = get_db_connection()
-    if not connection:
-        return []
     try:
-        cursor = connection.cursor()
-        cursor.execute("SELECT tag_name FROM TAGS")
-        tags = [row[0] for row in cursor.fetchall()]
-        return tags
-    except mysql.connector.Error as err:
+        return get_tag_dictionary().tag_names
+    except (ConnectionError, mysql.connector.Error) as err:
         st.error(f"태그 조회 오류: {err}")
         return []
-    finally:
-        cursor.close()
-        connection.close()
 
-# REVIEW_TAG 테이블의 열 목록 동적으로 가져오기
-@st.cache_data
+# REVIEW_TAG 스키마 레지스트리 (프로세스당 하나, REVIEW_SCHEMA_REVALIDATE 초마다 열 정의 해시만 확인)
+@st.cache_resource
+def get_review_schema():
+    return ReviewSchemaRegistry(db_pool, revalidate=int(os.getenv("REVIEW_SCHEMA_REVALIDATE", 300)))
+
+# app_id 별 리뷰 키워드 집계 테이블 (읽기 전용, 갱신은 refresh_keyword_summary.py 를 cron 으로 실행)
+# KEYWORD_SUMMARY_REVALIDATE 초마다 상태 테이블의 high water mark 만 다시 읽음
+@st.cache_resource
+def get_keyword_summary():
+    return KeywordSummaryStore(
+        db_pool,
+        get_review_schema(),
+        revalidate=int(os.getenv("KEYWORD_SUMMARY_REVALIDATE", 60))
+    )
+
+# REVIEW_TAG 테이블의 카테고리 열 목록 (불변 튜플)
 def fetch_review_categories():
-    connection = get_db_connection()
-    if not connection:
-        return []
     try:
-        cursor = connection.cursor()
-        cursor.execute("SHOW COLUMNS FROM REVIEW_TAG")
-        columns = [row[0] for row in cursor.fetchall()]
-        excluded = {'id', 'app_id', 'review_id', 'review_text'}
-        categories = [col for col in columns if col not in excluded]
-        if 'game' not in categories and 'game' in columns:
-            categories.append('game')
-        return categories
+        return get_review_schema().get_categories()
     except mysql.connector.Error as err:
         st.error(f"리뷰 카테고리 조회 오류: {err}")
-        return []
+        return get_review_schema().categories
+
+# TITLELIST 태그 역색인 (프로세스당 한 번 생성, TITLELIST_INDEX_TTL 초마다 다시 생성)
+@st.cache_resource(ttl=int(os.getenv("TITLELIST_INDEX_TTL", 3600)))
+def get_tag_index():
+    with db_pool.connection() as connection:
+        if not connection:
+            raise ConnectionError("TITLELIST 태그 색인을 만들 수 없습니다.")
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute("SELECT app_id, name, user_tags, userScore FROM TITLELIST")
+            return TagInvertedIndex(pd.DataFrame(cursor.fetchall()))
+        finally:
+            cursor.close()
+
+# REVIEW_TAG 를 나눠 읽을 때 한 번에 가져오는 행 수
+REVIEW_CHUNK_SIZE = int(os.getenv("REVIEW_CHUNK_SIZE", 5000))
+# 1 이면 타이틀별 리뷰 키워드 집계를 MySQL GROUP BY 로 실행 (0 이면 리뷰 행을 읽어 pandas / NumPy 로 집계)
+REVIEW_AGG_PUSHDOWN = os.getenv("REVIEW_AGG_PUSHDOWN", "1") == "1"
+
+# 타이틀들의 기본 열 (name, app_id, rating, tags, link) 과 키워드 집계를 DB 에서 읽음
+def load_title_parts(app_ids, categories, tag_dictionary, tag_index, keyword_summary):
+    connection = db_pool.acquire()
+    if not connection:
+        raise ConnectionError("리뷰를 읽을 커넥션이 없습니다.")
+    try:
+        # 집계 테이블이 준비되어 있으면 app_id 별 집계 행만 읽고,
+        # 아니면 pushdown 모드에서는 GROUP BY app_id 집계를 MySQL 에서 실행 (타이틀당 한 행만 전송),
+        # pushdown 을 끄면 리뷰 행을 모두 읽어 직접 집계
+        app_id_placeholders = ','.join(['%s'] * len(app_ids))
+        try:
+            summary_df = keyword_summary.read(connection, app_ids, categories)
+        except mysql.connector.Error:
+            summary_df = None
+        if summary_df is None and REVIEW_AGG_PUSHDOWN:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(
+                    keyword_summary_sql(categories, where=f"app_id IN ({app_id_placeholders})"),
+                    [int(app_id) for app_id in app_ids]
+                )
+                summary_df = pd.DataFrame(cursor.fetchall(), columns=keyword_summary_columns(categories))
+            finally:
+                cursor.close()
+        if summary_df is None:
+            review_df = read_reviews(
+                connection,
+                ["app_id", *categories],
+                f"app_id IN ({app_id_placeholders})",
+                [int(app_id) for app_id in app_ids],
+                dtypes={"app_id": np.int64, **{cat: np.int8 for cat in categories}},
+                chunk_size=REVIEW_CHUNK_SIZE,
+            )
+
+        titles = tag_index.rows(app_ids)
+        titles["tags"] = tag_index.tag_lists(app_ids, tag_dictionary)
+        titles["rating"] = titles["userScore"]
+        titles["link"] = titles["app_id"].apply(lambda x: f"https://store.steampowered.com/app/{x}")
+
+        # 타이틀 x 카테고리 긍정/부정 개수를 한 번의 그룹 집계로 계산 (titles 는 app_ids 순서)
+        if summary_df is not None:
+            keyword_matrix = KeywordMatrix.from_summary(app_ids, summary_df, categories)
+        else:
+            keyword_matrix = KeywordMatrix.from_reviews(app_ids, review_df, categories)
+        return titles[["name", "app_id", "rating", "tags", "link"]], keyword_matrix
     finally:
-        cursor.close()
-        connection.close()
+        db_pool.release(connection)
+
+# 선택한 tag_id 를 모두 가진 타이틀 표와 전체 긍정/부정 키워드 수
+# 같은 호스트의 다른 워커가 이미 계산해 공유 저장소에 둔 조합 / 부분 조합이 있으면 DB 를 읽지 않는다
+# st 호출 없이 오류는 예외로 올리므로 태그 조합 워밍업 스레드에서도 그대로 쓴다
+def load_titles_for_tag_ids(tag_ids, categories, tag_dictionary, tag_index, keyword_summary, shared_store, version):
+    # 선택한 태그를 모두 가진 타이틀은 역색인 교집합으로 찾는다
+    app_ids = tag_index.app_ids_with_all(tag_ids)
+    if not len(app_ids):
+        return pd.DataFrame(), {}, {}
+
+    parts = shared_store.get(tag_ids, version)
+    if parts is None:
+        # 태그를 하나 더 고른 경우처럼 이미 계산된 부분 조합이 있으면 가장 큰 것에서 타이틀 행만 골라낸다
+        _, subset_parts = shared_store.get_largest_subset(tag_ids, version)
+        if subset_parts is not None:
+            parts = take_title_parts(subset_parts, app_ids)
+        if parts is None:
+            parts = load_title_parts(app_ids, categories, tag_dictionary, tag_index, keyword_summary)
+        shared_store.put(tag_ids, version, *parts)
+    titles, keyword_matrix = parts
+    global_pos_counts, global_neg_counts = keyword_matrix.global_counts()
+    return title_frame(titles, keyword_matrix), global_pos_counts, global_neg_counts
 
 # 타이틀 및 리뷰 가져오기
-@st.cache_data(hash_funcs={list: lambda x: tuple(x)})
-def fetch_titles_by_tags(selected_tags):
-    connection = get_db_connection()
-    if not connection:
-        return pd.DataFrame(), {}, {}
+# 선택 순서와 상관없이 같은 태그 조합이면 같은 TagQuery 이므로 캐시 항목도 하나
+@loader_cache.cached(version=loader_cache_version, cacheable=lambda result: not result[0].empty)
+def fetch_titles_by_tags(tag_query):
+    categories = fetch_review_categories()
     try:
-        cursor = connection.cursor(dictionary=True)
-        cursor.execute("SELECT tag_id, tag_name FROM TAGS")
-        tag_results = cursor.fetchall()
-        tag_id_to_name = {tag['tag_id']: tag['tag_name'] for tag in tag_results}
-
-        tag_id_query = """
-        SELECT tag_id, tag_name
-        FROM TAGS
-        WHERE tag_name IN ({})
-        """
-        tag_placeholders = ','.join(['%s'] * len(selected_tags))
-        cursor.execute(tag_id_query.format(tag_placeholders), selected_tags)
-        selected_tag_results = cursor.fetchall()
-        tag_id_map = {tag['tag_name']: tag['tag_id'] for tag in selected_tag_results}
-
-        selected_tag_ids = [str(tag_id_map[tag]) for tag in selected_tags if tag in tag_id_map]
-        if not selected_tag_ids:
-            st.warning("선택한 태그에 해당하는 tag_id가 없습니다.")
-            return pd.DataFrame(), {}, {}
-
-        query = """
-        SELECT app_id, name, user_tags, userScore
-        FROM TITLELIST
-        WHERE {conditions}
-        """
-        conditions = " AND ".join([f"JSON_CONTAINS(user_tags, %s)" for _ in selected_tag_ids])
-        cursor.execute(query.format(conditions=conditions), [str(id) for id in selected_tag_ids])
-        results = cursor.fetchall()
-
-        categories = fetch_review_categories()
-        review_query_cols = ", ".join(categories)
-        review_query = f"""
-        SELECT app_id, review_id, {review_query_cols}
-        FROM REVIEW_TAG
-        WHERE app_id IN (SELECT app_id FROM TITLELIST WHERE {conditions})
-        """
-        cursor.execute(review_query.format(conditions=conditions), [str(id) for id in selected_tag_ids])
-        review_results = cursor.fetchall()
+        tag_dictionary = get_tag_dictionary()
+        tag_index = get_tag_index()
+    except (ConnectionError, mysql.connector.Error) as err:
+        st.error(f"태그 색인 생성 오류: {err}")
+        return pd.DataFrame(), {}, {}
 
-        df = pd.DataFrame(results)
-        review_df = pd.DataFrame(review_results)
-
-        if not df.empty:
-            def map_tags(tag_json):
-                try:
-                    tag_ids = json.loads(tag_json) if isinstance(tag_json, str) else tag_json
-                    return [tag_id_to_name.get(int(tid), str(tid)) for tid in tag_ids]
-                except:
-                    return []
-            df["tags"] = df["user_tags"].apply(map_tags)
-            df["rating"] = df["userScore"]
-            df["link"] = df["app_id"].apply(lambda x: f"https://store.steampowered.com/app/{x}")
-
-            review_df[categories] = review_df[categories].apply(pd.to_numeric, errors='coerce').fillna(0).astype(int)
-
-            pos_counts = review_df[categories].eq(1).groupby(review_df['app_id']).sum()
-            neg_counts = review_df[categories].eq(-1).groupby(review_df['app_id']).sum()
-            total_scores = review_df[categories].groupby(review_df['app_id']).sum().sum(axis=1)
-
-            global_pos_counts = review_df[categories].eq(1).sum().to_dict()
-            global_neg_counts = review_df[categories].eq(-1).sum().to_dict()
-
-            df["positive_keywords"] = df["app_id"].map(lambda x: [cat for cat in categories if pos_counts.loc[x][cat] > 0] if x in pos_counts.index else [])
-            df["negative_keywords"] = df["app_id"].map(lambda x: [cat for cat in categories if neg_counts.loc[x][cat] > 0] if x in neg_counts.index else [])
-            df["keyword_score"] = df["app_id"].map(lambda x: total_scores[x] if x in total_scores.index else 0)
-            df["positive_keyword_counts"] = df["app_id"].map(lambda x: pos_counts.loc[x].to_dict() if x in pos_counts.index else {})
-            df["negative_keyword_counts"] = df["app_id"].map(lambda x: neg_counts.loc[x].to_dict() if x in neg_counts.index else {})
-            df["reviews"] = df["app_id"].apply(lambda app_id: review_df[review_df["app_id"] == app_id]["review_text"].tolist() if "review_text" in review_df.columns else [])
-            df = df.drop_duplicates(subset=["app_id"]).reset_index(drop=True)
-            df = df[["name", "app_id", "rating", "tags", "link", "positive_keywords", "negative_keywords", "keyword_score", "positive_keyword_counts", "negative_keyword_counts", "reviews"]]
-        
-        return df, global_pos_counts, global_neg_counts
-    except mysql.connector.Error as err:
+    if not len(tag_query):
+        st.warning("선택한 태그에 해당하는 tag_id가 없습니다.")
+        return pd.DataFrame(), {}, {}
+
+    # 미리 계산해 둔 인기 태그 조합이면 DB 를 읽지 않는다
+    # 요약 테이블에 새 리뷰가 반영되면 버전이 바뀌어 예전 조합 결과는 쓰지 않는다
+    version = loader_cache_version()
+    cached = get_tag_combo_store().get(tag_query, version)
+    if cached is not None:
+        return cached
+    try:
+        return load_titles_for_tag_ids(
+            tag_query, categories, tag_dictionary, tag_index,
+            get_keyword_summary(), get_shared_title_store(), version
+        )
+    except (ConnectionError, mysql.connector.Error) as err:
         st.error(f"쿼리 실행 오류: {err}")
         return pd.DataFrame(), {}, {}
-    finally:
-        cursor.close()
-        connection.close()
+
+# 같은 호스트의 워커 프로세스들이 함께 쓰는 태그 조합 결과 저장소 (/dev/shm 이 없으면 .cache 아래 memory map 파일)
+@st.cache_resource
+def get_shared_title_store():
+    default_dir = "/dev/shm/steam_titles" if os.path.isdir("/dev/shm") else os.path.join(".cache", "shared_titles")
+    return SharedTitleStore(
+        os.getenv("SHARED_RESULTS_DIR", default_dir),
+        ttl=int(os.getenv("SHARED_RESULTS_TTL", 3600)),
+        max_bytes=int(os.getenv("SHARED_RESULTS_MB", 256)) * 1024 * 1024
+    )
+
+# 태그 조합별 fetch_titles_by_tags 결과 디스크 저장소
+@st.cache_resource
+def get_tag_combo_store():
+    return TagCombinationStore(
+        os.getenv("TAG_COMBO_CACHE_DIR", os.path.join(".cache", "tag_combos")),
+        ttl=int(os.getenv("TAG_COMBO_TTL", 86400))
+    )
+
+# 타이틀 수가 많은 태그 쌍 / 세 쌍의 결과를 백그라운드에서 미리 계산
+# (TITLELIST 색인을 새로 만들 때, 또는 로더 캐시 버전이 바뀌어 저장된 결과가 무효가 될 때마다 다시 실행)
+@st.cache_resource(ttl=int(os.getenv("TITLELIST_INDEX_TTL", 3600)))
+def get_tag_combo_warmer(version):
+    categories = fetch_review_categories()
+    tag_dictionary = get_tag_dictionary()
+    tag_index = get_tag_index()
+    keyword_summary = get_keyword_summary()
+    shared_store = get_shared_title_store()
+    combinations = top_tag_combinations(
+        tag_index.bitmaps,
+        n_pairs=int(os.getenv("TAG_COMBO_PAIRS", 50)),
+        n_triples=int(os.getenv("TAG_COMBO_TRIPLES", 50))
+    )
+    return TagCombinationWarmer(
+        get_tag_combo_store(),
+        [tag_ids for tag_ids, _ in combinations],
+        lambda tag_ids: load_titles_for_tag_ids(tag_ids, categories, tag_dictionary, tag_index, keyword_summary, shared_store, version),
+        version
+    ).start()
+
+# 선택된 타이틀들에 함께 붙은 태그 분포 (태그 비트맵으로 한 번에 집계, 제외 태그는 빼고)
+def count_cooccurring_tags(titles, excluded_tags):
+    try:
+        bitmaps = get_tag_index().bitmaps
+        tag_dictionary = get_tag_dictionary()
+    except (ConnectionError, mysql.connector.Error):
+        bitmaps = None
+    tag_counts = {}
+    if bitmaps is None:
+        for title in titles:
+            for tag in title["tags"]:
+                if tag not in excluded_tags:
+                    tag_counts[tag] = tag_counts.get(tag, 0) + 1
+        return tag_counts
+
+    selection = bitmaps.bitmap_of([title["app_id"] for title in titles])
+    for tag_id, count in bitmaps.cooccurrence(selection).items():
+        tag = tag_dictionary.name_of(tag_id)
+        if tag not in excluded_tags:
+            tag_counts[tag] = tag_counts.get(tag, 0) + count
+    return tag_counts
 
 # 리뷰 데이터 캐싱 및 처리 함수 추가
-@st.cache_data
+@loader_cache.cached(version=loader_cache_version, cacheable=lambda result: any(len(reviews) for reviews in result))
 def fetch_and_process_reviews(game_app_id):
-    connection = get_db_connection()
-    if not connection:
-        return [], []
-    try:
-        cursor = connection.cursor(dictionary=True)
-        categories = fetch_review_categories()
-        review_query_cols = ", ".join(categories + ["id", "review_id", "review_text"])
-        review_query = f"""
-        SELECT id, app_id, review_id, review_text, {review_query_cols}
-        FROM REVIEW_TAG
-        WHERE app_id = %s
-        """
-        cursor.execute(review_query, (game_app_id,))
-        reviews = cursor.fetchall()
-        cursor.close()
-        connection.close()
-
-        positive_reviews = []
-        negative_reviews = []
-        score_categories = [cat for cat in categories if cat != "review_text"]
-        for review in reviews:
-            score = sum([int(review[cat]) for cat in score_categories])
-            text_clean = re.sub(r'[^\w\s]', '', review["review_text"]).lower()
-            text_words = set(text_clean.split())
-            review_entry = {
-                "id": review["id"],
-                "app_id": review["app_id"],
-                "review_id": review["review_id"],
-                "text": review["review_text"],
-                "keyword_score": abs(score),
-                "text_words": text_words
-            }
-            review_entry.update({cat: int(review[cat]) for cat in score_categories})
-            if score > 0:
-                positive_reviews.append(review_entry)
-            elif score < 0:
-                negative_reviews.append(review_entry)
-        return positive_reviews, negative_reviews
-    except mysql.connector.Error as err:
-        st.error(f"리뷰 조회 오류: {err}")
-        return [], []
+    categories = fetch_review_categories()
+    empty_reviews = pd.DataFrame(columns=[*REVIEW_KEY_COLUMNS, *categories])
+    with db_pool.connection() as connection:
+        if not connection:
+            return classify_reviews(empty_reviews, categories)
+        try:
+            # 리뷰가 많은 게임도 id 순서로 REVIEW_CHUNK_SIZE 행씩 나눠 읽음
+            reviews = read_reviews(
+                connection,
+                [*REVIEW_KEY_COLUMNS, *categories],
+                "app_id = %s",
+                (int(game_app_id),),
+                dtypes={"app_id": np.int64, **{cat: np.int8 for cat in categories}},
+                chunk_size=REVIEW_CHUNK_SIZE,
+            )
+        except mysql.connector.Error as err:
+            st.error(f"리뷰 조회 오류: {err}")
+            return classify_reviews(empty_reviews, categories)
+
+    # 긍정 / 부정 리뷰 색인 (id, app_id, review_id, keyword_score, pos_mask, neg_mask (카테고리 64 개 이하), 카테고리별 int8 값)
+    # 리뷰 원문은 fetch_review_texts 로 화면에 보이는 리뷰만 읽는다
+    return classify_reviews(reviews, categories)
+
+# REVIEW_TAG.id 목록 -> {id: 리뷰 원문} (리뷰 표 한 페이지 / 선택한 리뷰만)
+@loader_cache.cached(version=loader_cache_version, cacheable=bool)
+def fetch_review_texts(review_ids):
+    if not review_ids:
+        return {}
+    with db_pool.connection() as connection:
+        if not connection:
+            return {}
+        cursor = connection.cursor()
+        try:
+            placeholders = ','.join(['%s'] * len(review_ids))
+            cursor.execute(f"SELECT id, review_text FROM REVIEW_TAG WHERE id IN ({placeholders})", list(review_ids))
+            return {review_id: review_text or "" for review_id, review_text in cursor.fetchall()}
+        except mysql.connector.Error as err:
+            st.error(f"리뷰 원문 조회 오류: {err}")
+            return {}
+        finally:
+            cursor.close()
+
+REVIEW_PAGE_SIZE = int(os.getenv("REVIEW_PAGE_SIZE", 50))
+
+# 리뷰 표를 한 페이지씩 그림 (선택 상태는 선택한 리뷰 id 집합으로만 보관)
+def review_page_editor(reviews, side):
+    page_key = f"{side}_review_page"
+    page_count = max(1, -(-len(reviews) // REVIEW_PAGE_SIZE))
+    # 위젯 기본값 대신 세션 상태로 초기값을 두어야 범위를 벗어난 페이지를 고칠 때 Streamlit 경고가 나지 않는다
+    if st.session_state.setdefault(page_key, 1) > page_count:
+        st.session_state[page_key] = page_count
+    page = st.number_input("페이지", min_value=1, max_value=page_count, step=1, key=page_key)
+
+    page_reviews = reviews.iloc[(page - 1) * REVIEW_PAGE_SIZE:page * REVIEW_PAGE_SIZE]
+    page_ids = page_reviews["id"].tolist()
+    texts = fetch_review_texts(tuple(page_ids))
+    selected_ids = st.session_state.setdefault(f"{side}_selection", set())
+    page_df = pd.DataFrame({
+        "리뷰 텍스트": [texts.get(review_id, "") for review_id in page_ids],
+        "키워드 점수": page_reviews["keyword_score"].to_numpy(),
+        "선택": [review_id in selected_ids for review_id in page_ids],
+    })
+
+    edited_df = st.data_editor(
+        page_df,
+        column_config={
+            "선택": st.column_config.CheckboxColumn("선택", default=False, width="small"),
+            "리뷰 텍스트": st.column_config.TextColumn("리뷰 텍스트", width="large"),
+            "키워드 점수": st.column_config.NumberColumn("키워드 점수", width="small")
+        },
+        disabled=["리뷰 텍스트", "키워드 점수"],
+        height=300,
+        use_container_width=True,
+        key=f"{side}_reviews_editor_{page}"
+    )
+    for review_id, checked in zip(page_ids, edited_df["선택"]):
+        if checked:
+            selected_ids.add(review_id)
+        else:
+            selected_ids.discard(review_id)
+    st.caption(f"{page} / {page_count} 페이지 · 선택한 리뷰 {int(reviews['id'].isin(selected_ids).sum())}개")
+    return selected_ids
+
+# 선택한 리뷰 id -> 원문을 붙인 리뷰 dict 목록 (상세보기 점수표용)
+def selected_review_records(reviews, selected_ids):
+    selected = reviews[reviews["id"].isin(selected_ids)]
+    texts = fetch_review_texts(tuple(selected["id"].tolist()))
+    records = selected.to_dict("records")
+    for record in records:
+        record["text"] = texts.get(record["id"], "")
+    return records
 
-# 워드 클라우드 색상 함수
 def color_func(word, font_size, position, orientation, random_state=None, **kwargs):
     if word in positive_keywords_set:
         return "green"
@@ -454,11 +744,28 @@ def go_back():
         st.session_state["page_history"] = ["홈 대시보드"]
     st.rerun()
 
-# 두 개 이상의 태그가 선택되었는지 확인
-if len(selected_tags) < 2:
+# 선택한 태그 이름들 -> 정규화한 태그 조합 (태그 사전을 읽지 못하면 빈 조합)
+def make_tag_query(tag_names):
+    try:
+        return TagQuery.from_names(tag_names, get_tag_dictionary())
+    except (ConnectionError, mysql.connector.Error) as err:
+        st.error(f"태그 조회 오류: {err}")
+        return TagQuery()
+
+tag_query = make_tag_query(selected_tags)
+
+# 두 개 이상의 태그가 선택되었는지 확인 (같은 태그를 두 번 고르면 하나로 셈)
+if len(tag_query) < 2:
     st.warning("두 개 이상의 태그를 선택해야 대시보드가 표시됩니다.")
 else:
-    df_titles, global_pos_counts, global_neg_counts = fetch_titles_by_tags(selected_tags)
+    df_titles, global_pos_counts, global_neg_counts = fetch_titles_by_tags(tag_query)
+    # 타이틀 상세에서 드롭다운을 옮길 때 기다리지 않도록 추천 행을 미리 읽어 둠 (MATRIX 는 이미 메모리에 있음)
+    if not df_titles.empty:
+        get_recommendation_prefetcher().prefetch(df_titles["app_id"])
+    try:
+        get_tag_combo_warmer(loader_cache_version())
+    except (ConnectionError, mysql.connector.Error):
+        pass
     filtered_titles = df_titles.to_dict("records") if not df_titles.empty else []
     st.session_state["filtered_titles"] = filtered_titles
     st.session_state["last_selected_tags"] = selected_tags
@@ -470,11 +777,7 @@ else:
             st.warning("선택한 태그에 해당하는 타이틀이 없습니다.")
         else:
             col5, col6 = st.columns(2)
-            tag_counts = {}
-            for title in filtered_titles:
-                for tag in title["tags"]:
-                    if tag not in selected_tags:
-                        tag_counts[tag] = tag_counts.get(tag, 0) + 1
+            tag_counts = count_cooccurring_tags(filtered_titles, selected_tags)
 
             with col5:
                 st.subheader("선택한 태그 외 분포 (워드 클라우드)")
@@ -569,7 +872,7 @@ else:
                 st.write(f"🔍타이틀 개수: {len(df_titles)}")
                 st.write("**👇체크박스를 선택 후 버튼을 눌러 상세 보기로 이동하세요.**")
                 df_titles = df_titles.reset_index(drop=True)
-                current_tag_key = ''.join(selected_tags)
+                current_tag_key = tag_query.key()
                 if "last_tag_key" not in st.session_state or st.session_state["last_tag_key"] != current_tag_key:
                     df_titles["선택"] = False
                     st.session_state["edited_titles"] = df_titles[["선택", "name", "app_id", "rating", "tags"]]
@@ -778,7 +1081,7 @@ else:
         else:
             sorted_titles = sorted(keyword_titles, key=lambda x: x["keyword_score"], reverse=True)
             df = pd.DataFrame(sorted_titles).reset_index(drop=True)
-            current_filter_key = f"{','.join(type_category)}_{','.join(selected_keywords)}_{''.join(selected_tags)}"
+            current_filter_key = f"{','.join(type_category)}_{','.join(selected_keywords)}_{tag_query.key()}"
             if "edited_keyword_titles" not in st.session_state or st.session_state.get("last_filter_key") != current_filter_key:
                 df["선택"] = False
                 st.session_state["edited_keyword_titles"] = df[["선택", "name", "app_id", "link", "rating", "tags", "positive_keywords", "negative_keywords", "keyword_score"]]
@@ -902,41 +1205,70 @@ else:
             )
 
             st.subheader("추천 게임 목록")
+            recommend_k = st.number_input("추천 개수", min_value=1, max_value=100, value=10, step=1, key="recommend_k")
             similar_games_df = fetch_similar_games(title_info["app_id"])
             matrix_similar_df = fetch_matrix_similar_games(title_info["app_id"])
 
+            # SIMILAR_GAMES 에 미리 계산된 추천은 저장된 순서 그대로 모두 보여 준다 (유사율은 MATRIX 값)
             if not similar_games_df.empty:
                 combined_df = similar_games_df.merge(
                     matrix_similar_df[["recommended_app_id", "similarity"]],
                     on="recommended_app_id",
                     how="left"
                 )
-                combined_df["similarity"] = combined_df["similarity"].fillna(0)
-                combined_df = combined_df.sort_values("similarity", ascending=False).drop_duplicates(subset=["recommended_app_id"], keep="first")
-
-                # similarity 열을 퍼센트 문자열로 변환 (소수점 둘째 자리까지)
-                combined_df["similarity"] = combined_df["similarity"].apply(lambda x: f"{x:.2f}%")
+                # MATRIX 상위 9개에 없는 추천 게임은 유사율을 비워 두고, 척도가 다른 유사도 엔진 값은 별도 열에 참고로만 표시
+                missing = combined_df["similarity"].isna()
+                combined_df["engine_similarity"] = np.nan
+                if missing.any():
+                    combined_df.loc[missing, "engine_similarity"] = compute_similarity_between(title_info["app_id"], combined_df.loc[missing, "recommended_app_id"])
+            else:
+                combined_df = pd.DataFrame()
+
+            # SIMILAR_GAMES 추천이 추천 개수보다 적으면 유사도 엔진 결과로 모자란 만큼 채우되,
+            # 유사율 척도가 달라 한 표에 섞어 정렬하지 않고 엔진 유사율 순으로 따로 보여 준다
+            engine_df = pd.DataFrame()
+            if len(combined_df) < recommend_k:
+                engine_df = compute_similar_games(title_info["app_id"], k=recommend_k + len(combined_df))
+                if not combined_df.empty:
+                    engine_df = engine_df[~engine_df["recommended_app_id"].isin(combined_df["recommended_app_id"])]
+                engine_df = engine_df.sort_values("similarity", ascending=False).drop_duplicates(subset=["recommended_app_id"], keep="first").head(recommend_k - len(combined_df))
+
+            def show_recommendations(recommend_df, similarity_label):
+                recommend_df = recommend_df.copy()
+                # 유사율 열을 퍼센트 문자열로 변환 (소수점 둘째 자리까지, 값이 없으면 -)
+                for column in ("similarity", "engine_similarity"):
+                    if column in recommend_df:
+                        recommend_df[column] = recommend_df[column].apply(lambda x: f"{x:.2f}%" if pd.notna(x) else "-")
 
                 def highlight_similarity(row):
-                    # 문자열에서 % 제거 후 float로 변환해 비교
+                    # 문자열에서 % 제거 후 float로 변환해 비교 (유사율 열 기준, 비어 있으면 강조하지 않음)
+                    if row["similarity"] == "-":
+                        return [''] * len(row)
                     sim_value = float(row["similarity"].replace("%", ""))
                     if sim_value >= 50:  # 50% 이상 강조
                         return ['background-color: #d4edda'] * len(row)
                     return [''] * len(row)
 
                 st.dataframe(
-                    combined_df.style.apply(highlight_similarity, axis=1),
+                    recommend_df.style.apply(highlight_similarity, axis=1),
                     column_config={
                         "recommended_title": "추천 타이틀",
                         "recommended_app_id": "추천 App ID",
                         "tags": "태그",
                         "link": st.column_config.LinkColumn("링크"),
-                        "similarity": st.column_config.TextColumn("유사율")  # 숫자가 아닌 문자열로 처리
+                        "similarity": st.column_config.TextColumn(similarity_label),  # 숫자가 아닌 문자열로 처리
+                        "engine_similarity": st.column_config.TextColumn("엔진 유사율 (참고)")
                     },
                     height=300,
                     use_container_width=True
                 )
-            else:
+
+            if not combined_df.empty:
+                show_recommendations(combined_df, "유사율")
+            if not engine_df.empty:
+                st.write("#### 유사도 엔진 추천")
+                show_recommendations(engine_df, "엔진 유사율")
+            if combined_df.empty and engine_df.empty:
                 st.write("이 게임에 대한 추천 게임이 없습니다.")
 
             # 캐싱된 함수로 리뷰 데이터 가져오기
@@ -951,21 +1283,10 @@ else:
             highlighted_negative_keywords = [kw for kw, count in title_info["negative_keyword_counts"].items() if count >= negative_threshold and count > 2]
 
             # 키워드 필터링 (모든 선택된 키워드가 포함된 리뷰만)
-            if st.session_state["selected_positive_keywords"]:
-                positive_reviews = [
-                    r for r in positive_reviews 
-                    if all(r[kw] == 1 for kw in st.session_state["selected_positive_keywords"])
-                ]
-
-            if st.session_state["selected_negative_keywords"]:
-                negative_reviews = [
-                    r for r in negative_reviews 
-                    if all(r[kw] == -1 for kw in st.session_state["selected_negative_keywords"])
-                ]
-
-            # 정렬: keyword_score 내림차순
-            positive_reviews = sorted(positive_reviews, key=lambda x: x["keyword_score"], reverse=True)
-            negative_reviews = sorted(negative_reviews, key=lambda x: x["keyword_score"], reverse=True)
+            # 선택한 키워드를 비트마스크 하나로 묶어 (mask & 선택) == 선택 으로 거름, 카테고리가 64 개를 넘으면 키워드 열을 직접 비교 (표는 keyword_score 내림차순으로 정렬되어 있음)
+            review_categories = fetch_review_categories()
+            positive_reviews = filter_by_keywords(positive_reviews, review_categories, st.session_state["selected_positive_keywords"], 1)
+            negative_reviews = filter_by_keywords(negative_reviews, review_categories, st.session_state["selected_negative_keywords"], -1)
 
             col7, col8 = st.columns(2)
             with col7:
@@ -1040,36 +1361,15 @@ else:
             col9, col10 = st.columns(2)
             with col9:
                 st.write("### 긍정 리뷰")
-                if positive_reviews:
+                if not positive_reviews.empty:
                     st.write(f"긍정 리뷰 개수: {len(positive_reviews)}")
 
-                    positive_df = pd.DataFrame(positive_reviews)
-                    positive_df_display = positive_df[["text", "keyword_score"]].rename(columns={"text": "리뷰 텍스트", "keyword_score": "키워드 점수"})
-                    
-                    current_length = len(positive_df_display)
-                    if ("positive_selection" not in st.session_state or 
-                        len(st.session_state["positive_selection"]) != current_length):
-                        st.session_state["positive_selection"] = [False] * current_length
-                    
-                    positive_df_display["선택"] = st.session_state["positive_selection"]
-                    
-                    edited_positive_df = st.data_editor(
-                        positive_df_display,
-                        column_config={
-                            "선택": st.column_config.CheckboxColumn("선택", default=False, width="small"),
-                            "리뷰 텍스트": st.column_config.TextColumn("리뷰 텍스트", width="large"),
-                            "키워드 점수": st.column_config.NumberColumn("키워드 점수", width="small")
-                        },
-                        height=300,
-                        use_container_width=True,
-                        key="positive_reviews_editor"
-                    )
-                    st.session_state["positive_selection"] = edited_positive_df["선택"].tolist()
+                    selected_ids = review_page_editor(positive_reviews, "positive")
 
                     if st.button("긍정 리뷰 상세보기", key="positive_detail_button"):
-                        selected_indices = edited_positive_df[edited_positive_df["선택"]].index
-                        if not selected_indices.empty:
-                            st.session_state["selected_positive_reviews"] = [positive_reviews[i] for i in selected_indices]
+                        selected_records = selected_review_records(positive_reviews, selected_ids)
+                        if selected_records:
+                            st.session_state["selected_positive_reviews"] = selected_records
                             st.session_state["show_positive_detail"] = True
                             st.rerun()
                 else:
@@ -1077,35 +1377,14 @@ else:
 
             with col10:
                 st.write("### 부정 리뷰")
-                if negative_reviews:
+                if not negative_reviews.empty:
                     st.write(f"부정 리뷰 개수: {len(negative_reviews)}")
-                    negative_df = pd.DataFrame(negative_reviews)
-                    negative_df_display = negative_df[["text", "keyword_score"]].rename(columns={"text": "리뷰 텍스트", "keyword_score": "키워드 점수"})
-                    
-                    current_length = len(negative_df_display)
-                    if ("negative_selection" not in st.session_state or 
-                        len(st.session_state["negative_selection"]) != current_length):
-                        st.session_state["negative_selection"] = [False] * current_length
-                    
-                    negative_df_display["선택"] = st.session_state["negative_selection"]
-                    
-                    edited_negative_df = st.data_editor(
-                        negative_df_display,
-                        column_config={
-                            "선택": st.column_config.CheckboxColumn("선택", default=False, width="small"),
-                            "리뷰 텍스트": st.column_config.TextColumn("리뷰 텍스트", width="large"),
-                            "키워드 점수": st.column_config.NumberColumn("키워드 점수", width="small")
-                        },
-                        height=300,
-                        use_container_width=True,
-                        key="negative_reviews_editor"
-                    )
-                    st.session_state["negative_selection"] = edited_negative_df["선택"].tolist()
+                    selected_ids = review_page_editor(negative_reviews, "negative")
 
                     if st.button("부정 리뷰 상세보기", key="negative_detail_button"):
-                        selected_indices = edited_negative_df[edited_negative_df["선택"]].index
-                        if not selected_indices.empty:
-                            st.session_state["selected_negative_reviews"] = [negative_reviews[i] for i in selected_indices]
+                        selected_records = selected_review_records(negative_reviews, selected_ids)
+                        if selected_records:
+                            st.session_state["selected_negative_reviews"] = selected_records
                             st.session_state["show_negative_detail"] = True
                             st.rerun()
                 else:
@@ -1158,8 +1437,7 @@ else:
                 if st.button("긍정 리뷰 초기화", key="back_to_positive_reviews"):
                     st.session_state["show_positive_detail"] = False
                     st.session_state.pop("selected_positive_reviews", None)
-                    if positive_reviews:
-                        st.session_state["positive_selection"] = [False] * len(positive_df_display)
+                    st.session_state["positive_selection"] = set()
                     st.rerun()
 
             # 부정 리뷰 상세보기
@@ -1209,8 +1487,7 @@ else:
                 if st.button("부정 리뷰 초기화", key="back_to_negative_reviews"):
                     st.session_state["show_negative_detail"] = False
                     st.session_state.pop("selected_negative_reviews", None)
-                    if negative_reviews:
-                        st.session_state["negative_selection"] = [False] * len(negative_df_display)
+                    st.session_state["negative_selection"] = set()
                     st.rerun()
 
             st.markdown("---")
@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+# get_db_connection 위에서 동작하는 프로세스 전역 MySQL 커넥션 풀
+# - size: 동시에 열어 둘 수 있는 최대 커넥션 수 (초과 요청은 timeout 초까지 대기)
+# - recycle: 이 시간(초) 이상 놀고 있던 커넥션은 닫고 새로 연결
+# - 대여 직전에 ping 으로 커넥션 상태를 확인
+class ConnectionPool:
+    def __init__(self, connect, size=5, recycle=300, timeout=10):
+        self._connect = connect
+        self.size = size
+        self.recycle = recycle
+        self.timeout = timeout
+        self._idle = deque()  # (커넥션, 반납 시각)
+        self._open = 0  # 대여 중 + 대기 중인 커넥션 수
+        self._cond = threading.Condition()
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "timeouts": 0,
+            "connects": 0,
+            "recycled": 0,
+            "broken": 0,
+        }
+
+    def _count(self, name, value=1):
+        with self._cond:
+            self._stats[name] += value
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_alive(connection):
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    # 오래 놀고 있던 커넥션 정리 (락을 잡은 상태에서 호출)
+    def _reap_idle(self):
+        now = time.monotonic()
+        expired = []
+        while self._idle and now - self._idle[0][1] > self.recycle:
+            expired.append(self._idle.popleft()[0])
+            self._open -= 1
+        self._stats["recycled"] += len(expired)
+        return expired
+
+    def acquire(self):
+        with self._cond:
+            self._stats["checkouts"] += 1
+            expired = self._reap_idle()
+            if not self._idle and self._open >= self.size:
+                self._stats["waits"] += 1
+                started = time.monotonic()
+                deadline = started + self.timeout
+                while not self._idle and self._open >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                self._stats["wait_seconds"] += time.monotonic() - started
+            if self._idle:
+                # 가장 최근에 반납된(가장 따뜻한) 커넥션부터 사용
+                connection = self._idle.pop()[0]
+            elif self._open < self.size:
+                connection = None
+                self._open += 1
+            else:
+                self._stats["timeouts"] += 1
+                connection = False
+
+        for stale in expired:
+            self._close(stale)
+        if connection is False:
+            return None
+
+        if connection is not None and not self._is_alive(connection):
+            self._count("broken")
+            self._close(connection)
+            connection = None
+
+        if connection is None:
+            connection = self._connect()
+            if not connection:
+                with self._cond:
+                    self._open -= 1
+                    self._cond.notify()
+                return None
+            # 읽기 전용 조회만 하므로 반납 후에도 이전 트랜잭션 스냅샷이 남지 않도록 autocommit 사용
+            connection.autocommit = True
+            self._count("connects")
+        return connection
+
+    def release(self, connection):
+        if not connection:
+            return
+        with self._cond:
+            self._idle.append((connection, time.monotonic()))
+            expired = self._reap_idle()
+            self._cond.notify()
+        for stale in expired:
+            self._close(stale)
+
+    @contextmanager
+    def connection(self):
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    # 풀 상태 및 누적 카운터
+    def stats(self):
+        with self._cond:
+            snapshot = dict(self._stats)
+            snapshot["open"] = self._open
+            snapshot["idle"] = len(self._idle)
+            snapshot["in_use"] = self._open - len(self._idle)
+            snapshot["size"] = self.size
+        return snapshot
+
+    def close(self):
+        with self._cond:
+            idle = [connection for connection, _ in self._idle]
+            self._open -= len(idle)
+            self._idle.clear()
+        for connection in idle:
+            self._close(connection)
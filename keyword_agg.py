@@ -0,0 +1,293 @@
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+# 타이틀 x 카테고리 리뷰 키워드 집계
+# - pos / neg: 카테고리 값이 1 / -1 인 리뷰 수 (int32 행렬)
+# - score: 타이틀별 카테고리 값 총합
+# - has_reviews: REVIEW_TAG 에 리뷰가 하나라도 있는 타이틀
+class KeywordMatrix:
+    def __init__(self, app_ids, categories, pos, neg, score, has_reviews, review_count=None):
+        self.app_ids = app_ids
+        self.categories = tuple(categories)
+        self.pos = pos
+        self.neg = neg
+        self.score = score
+        self.has_reviews = has_reviews
+        self.review_count = review_count if review_count is not None else has_reviews.astype(np.int64)
+
+    def __len__(self):
+        return len(self.app_ids)
+
+    # 리뷰 행(app_id + 카테고리 값)을 app_id 기준으로 한 번에 묶어 집계
+    @classmethod
+    def from_reviews(cls, app_ids, review_df, categories):
+        app_ids = np.asarray(app_ids, dtype=np.int64)
+        n, c = len(app_ids), len(categories)
+        totals = np.zeros((n, 3 * c), dtype=np.int64)
+        review_count = np.zeros(n, dtype=np.int64)
+        if len(review_df):
+            values = review_df[list(categories)].apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+            rows = np.searchsorted(app_ids, review_df["app_id"].to_numpy(dtype=np.int64))
+            known = rows < n
+            known[known] = app_ids[rows[known]] == review_df["app_id"].to_numpy(dtype=np.int64)[known]
+            rows, values = rows[known], values[known]
+
+            order = np.argsort(rows, kind="stable")
+            rows, values = rows[order], values[order]
+            stacked = np.hstack([values == 1, values == -1, values]).astype(np.int64)
+            if len(rows):
+                starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+                group_rows = rows[starts]
+                totals[group_rows] = np.add.reduceat(stacked, starts, axis=0)
+                review_count[group_rows] = np.diff(np.r_[starts, len(rows)])
+
+        return cls(
+            app_ids,
+            categories,
+            totals[:, :c].astype(np.int32),
+            totals[:, c:2 * c].astype(np.int32),
+            totals[:, 2 * c:].sum(axis=1),
+            review_count > 0,
+            review_count,
+        )
+
+    # app_id 별 집계 행 (app_id, review_count, pos_*, neg_*, score_*) 으로 생성
+    @classmethod
+    def from_summary(cls, app_ids, summary_df, categories):
+        app_ids = np.asarray(app_ids, dtype=np.int64)
+        n, c = len(app_ids), len(categories)
+        pos = np.zeros((n, c), dtype=np.int32)
+        neg = np.zeros((n, c), dtype=np.int32)
+        score = np.zeros(n, dtype=np.int64)
+        review_count = np.zeros(n, dtype=np.int64)
+        if len(summary_df):
+            rows = np.searchsorted(app_ids, summary_df["app_id"].to_numpy(dtype=np.int64))
+            known = rows < n
+            known[known] = app_ids[rows[known]] == summary_df["app_id"].to_numpy(dtype=np.int64)[known]
+            summary_df, rows = summary_df[known], rows[known]
+            numeric = lambda cols: summary_df[cols].apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+            pos[rows] = numeric([f"pos_{cat}" for cat in categories])
+            neg[rows] = numeric([f"neg_{cat}" for cat in categories])
+            score[rows] = numeric([f"score_{cat}" for cat in categories]).sum(axis=1)
+            review_count[rows] = numeric(["review_count"])[:, 0]
+        return cls(app_ids, categories, pos, neg, score, review_count > 0, review_count)
+
+    # 일부 타이틀 (행 번호) 만 남긴 집계
+    def take(self, rows):
+        return KeywordMatrix(
+            self.app_ids[rows],
+            self.categories,
+            self.pos[rows],
+            self.neg[rows],
+            self.score[rows],
+            self.has_reviews[rows],
+            self.review_count[rows],
+        )
+
+    def global_counts(self):
+        pos = self.pos.sum(axis=0, dtype=np.int64)
+        neg = self.neg.sum(axis=0, dtype=np.int64)
+        return (
+            dict(zip(self.categories, pos.tolist())),
+            dict(zip(self.categories, neg.tolist())),
+        )
+
+    # 타이틀별 dict / list 뷰 (페이지에서 읽을 때 계산)
+    def count_views(self, negative=False):
+        counts = self.neg if negative else self.pos
+        return object_column(KeywordCounts(counts, row, self.categories, self.has_reviews[row]) for row in range(len(self)))
+
+    def keyword_views(self, negative=False):
+        counts = self.neg if negative else self.pos
+        return object_column(KeywordList(counts, row, self.categories) for row in range(len(self)))
+
+
+# (타이틀 기본 열, KeywordMatrix) 에서 app_ids 타이틀만 골라냄
+# 태그를 더 고른 조합의 타이틀은 부분 조합 타이틀의 부분집합이므로 DB 를 다시 읽지 않고 행만 다시 자른다
+# (app_ids 중 하나라도 parts 에 없으면 None)
+def take_title_parts(parts, app_ids):
+    titles, keyword_matrix = parts
+    app_ids = np.asarray(app_ids, dtype=np.int64)
+    if not len(keyword_matrix.app_ids):
+        return None if len(app_ids) else parts
+    rows = np.minimum(np.searchsorted(keyword_matrix.app_ids, app_ids), len(keyword_matrix.app_ids) - 1)
+    if not np.array_equal(keyword_matrix.app_ids[rows], app_ids):
+        return None
+    return titles.iloc[rows].reset_index(drop=True), keyword_matrix.take(rows)
+
+
+TITLE_FRAME_COLUMNS = [
+    "name", "app_id", "rating", "tags", "link",
+    "positive_keywords", "negative_keywords", "keyword_score",
+    "positive_keyword_counts", "negative_keyword_counts",
+]
+
+
+# 타이틀 기본 열 (name, app_id, rating, tags, link) + 키워드 집계 -> 대시보드 타이틀 표
+def title_frame(titles, keyword_matrix):
+    df = titles.reset_index(drop=True)
+    df["positive_keywords"] = keyword_matrix.keyword_views()
+    df["negative_keywords"] = keyword_matrix.keyword_views(negative=True)
+    df["keyword_score"] = keyword_matrix.score
+    df["positive_keyword_counts"] = keyword_matrix.count_views()
+    df["negative_keyword_counts"] = keyword_matrix.count_views(negative=True)
+    return df[TITLE_FRAME_COLUMNS]
+
+
+def keyword_summary_columns(categories):
+    return (
+        ["app_id", "review_count"]
+        + [f"pos_{cat}" for cat in categories]
+        + [f"neg_{cat}" for cat in categories]
+        + [f"score_{cat}" for cat in categories]
+    )
+
+
+# REVIEW_TAG 를 app_id 별로 묶어 카테고리별 긍정 수 / 부정 수 / 점수 합계를 내는 집계 쿼리
+# (결과 열: app_id, review_count, pos_<cat>..., neg_<cat>..., score_<cat>...)
+def keyword_summary_sql(categories, where=""):
+    pos_cols = ", ".join(f"SUM({cat} = 1) AS pos_{cat}" for cat in categories)
+    neg_cols = ", ".join(f"SUM({cat} = -1) AS neg_{cat}" for cat in categories)
+    score_cols = ", ".join(f"SUM({cat}) AS score_{cat}" for cat in categories)
+    return f"""
+    SELECT app_id, COUNT(*) AS review_count, {pos_cols}, {neg_cols}, {score_cols}
+    FROM REVIEW_TAG
+    {f"WHERE {where}" if where else ""}
+    GROUP BY app_id
+    """
+
+
+# 시퀀스/매핑 객체를 그대로 담는 object 배열 (numpy 가 2차원 배열로 펼치지 않도록)
+def object_column(items):
+    items = list(items)
+    column = np.empty(len(items), dtype=object)
+    for i, item in enumerate(items):
+        column[i] = item
+    return column
+
+
+# 한 타이틀의 {카테고리: 개수} 뷰 (리뷰가 없는 타이틀은 빈 dict 처럼 동작)
+class KeywordCounts(Mapping):
+    __slots__ = ("_counts", "_row", "_categories", "_has_reviews")
+
+    def __init__(self, counts, row, categories, has_reviews):
+        self._counts = counts
+        self._row = row
+        self._categories = categories
+        self._has_reviews = bool(has_reviews)
+
+    def __getitem__(self, key):
+        if not self._has_reviews or key not in self._categories:
+            raise KeyError(key)
+        return int(self._counts[self._row, self._categories.index(key)])
+
+    def __iter__(self):
+        return iter(self._categories if self._has_reviews else ())
+
+    def __len__(self):
+        return len(self._categories) if self._has_reviews else 0
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+# 한 타이틀에서 개수가 1 이상인 카테고리 목록 뷰
+class KeywordList(Sequence):
+    __slots__ = ("_counts", "_row", "_categories", "_items")
+
+    def __init__(self, counts, row, categories):
+        self._counts = counts
+        self._row = row
+        self._categories = categories
+        self._items = None
+
+    def _list(self):
+        if self._items is None:
+            self._items = [cat for cat, count in zip(self._categories, self._counts[self._row]) if count > 0]
+        return self._items
+
+    def __getitem__(self, index):
+        return self._list()[index]
+
+    def __len__(self):
+        return len(self._list())
+
+    def __add__(self, other):
+        return self._list() + list(other)
+
+    def __radd__(self, other):
+        return list(other) + self._list()
+
+    def __eq__(self, other):
+        return self._list() == list(other) if isinstance(other, (list, tuple, Sequence)) else NotImplemented
+
+    def __repr__(self):
+        return repr(self._list())
+
+
+# 비트마스크 한 칸에 담을 수 있는 최대 카테고리 수
+MAX_MASK_CATEGORIES = 64
+
+
+# 카테고리 i 를 i 번째 비트로 쓰는 키워드 비트마스크 dtype (카테고리가 64 개를 넘으면 None, 이때는 마스크를 만들지 않음)
+def keyword_mask_dtype(categories):
+    if len(categories) > MAX_MASK_CATEGORIES:
+        return None
+    return np.uint32 if len(categories) <= 32 else np.uint64
+
+
+# 선택한 키워드들 -> 하나의 비트마스크 (카테고리에 없는 키워드는 무시)
+def keyword_mask(categories, keywords):
+    dtype = keyword_mask_dtype(categories)
+    mask = dtype(0)
+    for keyword in keywords:
+        if keyword in categories:
+            mask |= dtype(1) << dtype(list(categories).index(keyword))
+    return mask
+
+
+REVIEW_KEY_COLUMNS = ["id", "app_id", "review_id"]
+
+
+# 한 타이틀의 리뷰 표 (id, app_id, review_id, 카테고리...) -> 긍정 / 부정 리뷰 표 (리뷰 원문은 페이지별로 따로 읽음)
+# 카테고리 값은 int8 행렬로 한 번에 읽고, 점수는 행 합계, 긍정/부정은 점수 부호 마스크로 나눈다
+# 카테고리 값이 1 / -1 인 비트를 pos_mask / neg_mask 로 묶어 두고 (카테고리가 64 개 이하일 때만), 표는 keyword_score 내림차순으로 미리 정렬한다
+def classify_reviews(review_df, categories):
+    categories = list(categories)
+    raw = review_df.reset_index(drop=True) if len(review_df) else pd.DataFrame(columns=[*REVIEW_KEY_COLUMNS, *categories])
+    values = raw[categories].apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy(dtype=np.int8)
+    score = values.sum(axis=1, dtype=np.int32)
+
+    reviews = raw[REVIEW_KEY_COLUMNS].copy()
+    reviews["keyword_score"] = np.abs(score)
+    dtype = keyword_mask_dtype(categories)
+    if dtype is not None:
+        bits = dtype(1) << np.arange(len(categories), dtype=dtype)
+        reviews["pos_mask"] = np.bitwise_or.reduce(np.where(values == 1, bits, dtype(0)), axis=1) if categories else dtype(0)
+        reviews["neg_mask"] = np.bitwise_or.reduce(np.where(values == -1, bits, dtype(0)), axis=1) if categories else dtype(0)
+    reviews = pd.concat([reviews, pd.DataFrame(values, columns=categories)], axis=1)
+    reviews = reviews.iloc[np.argsort(-reviews["keyword_score"].to_numpy(), kind="stable")]
+    score = score[reviews.index.to_numpy()]
+    return (
+        reviews[score > 0].reset_index(drop=True),
+        reviews[score < 0].reset_index(drop=True),
+    )
+
+
+# 선택한 키워드가 모두 value (1: 긍정, -1: 부정) 인 리뷰만 (정렬 순서 유지)
+# 마스크 열이 있으면 비트 연산 한 번으로, 카테고리가 많아 마스크가 없으면 키워드 열 값을 직접 비교
+def filter_by_keywords(reviews, categories, keywords, value):
+    keywords = [keyword for keyword in keywords if keyword in categories]
+    if not keywords:
+        return reviews
+    mask_column = "pos_mask" if value > 0 else "neg_mask"
+    if mask_column in reviews:
+        mask = keyword_mask(categories, keywords)
+        selected = (reviews[mask_column].to_numpy() & mask) == mask
+    else:
+        selected = (reviews[keywords].to_numpy() == value).all(axis=1)
+    return reviews[selected].reset_index(drop=True)
+
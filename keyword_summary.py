@@ -0,0 +1,174 @@
+import threading
+import time
+
+import pandas as pd
+
+from keyword_agg import keyword_summary_columns, keyword_summary_sql
+
+SUMMARY_TABLE = "REVIEW_TAG_SUMMARY"
+STATE_TABLE = "REVIEW_TAG_SUMMARY_STATE"
+BUILD_TABLE = f"{SUMMARY_TABLE}_BUILD"
+RETIRED_TABLE = f"{SUMMARY_TABLE}_OLD"
+# 여러 곳에서 갱신 스크립트가 동시에 돌지 않도록 잡는 MySQL 이름 잠금
+REFRESH_LOCK = "REVIEW_TAG_SUMMARY_REFRESH"
+APP_BATCH = 500
+
+
+def _table_exists(cursor, table):
+    cursor.execute(
+        "SELECT COUNT(*) FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+        (table,),
+    )
+    return cursor.fetchone()[0] > 0
+
+
+def _create_summary_table(cursor, table, categories):
+    count_cols = ", ".join(f"{col} INT NOT NULL DEFAULT 0" for col in keyword_summary_columns(categories)[1:])
+    cursor.execute(f"CREATE TABLE {table} (app_id BIGINT NOT NULL PRIMARY KEY, {count_cols})")
+
+
+# app_id 별 리뷰 키워드 집계 테이블 (REVIEW_TAG_SUMMARY) 을 갱신 -> 다시 집계한 app_id 수 (다른 곳에서 갱신 중이면 None)
+# 앱이 아니라 refresh_keyword_summary.py (cron) 에서만 호출하며, DDL 권한은 이 스크립트의 DB 계정에만 있으면 된다
+# - GET_LOCK 으로 갱신 작업을 한 번에 하나만 실행
+# - 상태 테이블에 마지막으로 반영한 REVIEW_TAG.id (high water mark) 와 스키마 지문을 저장
+# - 카테고리 열 구성이 바뀌었거나 요약 테이블이 없으면 새 테이블에 처음부터 집계한 뒤 RENAME TABLE 로 한 번에 교체
+#   (읽는 쪽은 교체 전 테이블이나 교체 후 테이블 중 하나만 보게 된다)
+# - 그 밖에는 high water mark 이후에 들어온 리뷰가 있는 app_id 만 다시 집계해 덮어쓴다
+# - 기존 리뷰 행의 수정 / 삭제는 id 로 알 수 없으므로 반영되지 않는다
+# categories / fingerprint 는 호출하는 쪽이 커넥션을 잡기 전에 스키마 레지스트리에서 읽어 넘긴다 (풀 커넥션을 두 개 잡지 않도록)
+def refresh_keyword_summary(connection, categories, fingerprint):
+    if not categories or fingerprint is None:
+        raise ConnectionError("REVIEW_TAG 스키마를 읽을 수 없습니다.")
+    columns = ", ".join(keyword_summary_columns(categories))
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT GET_LOCK(%s, 0)", (REFRESH_LOCK,))
+        if cursor.fetchone()[0] != 1:
+            return None
+        try:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {STATE_TABLE} ("
+                "id TINYINT NOT NULL PRIMARY KEY, high_water BIGINT NOT NULL, fingerprint VARCHAR(64) NOT NULL)"
+            )
+            cursor.execute(f"SELECT high_water, fingerprint FROM {STATE_TABLE} WHERE id = 1")
+            state = cursor.fetchone()
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM REVIEW_TAG")
+            new_high_water = int(cursor.fetchone()[0])
+
+            if state is None or state[1] != fingerprint or not _table_exists(cursor, SUMMARY_TABLE):
+                cursor.execute(f"DROP TABLE IF EXISTS {BUILD_TABLE}")
+                _create_summary_table(cursor, BUILD_TABLE, categories)
+                cursor.execute(
+                    f"INSERT INTO {BUILD_TABLE} ({columns}) "
+                    + keyword_summary_sql(categories, where="id <= %s"),
+                    (new_high_water,),
+                )
+                connection.commit()
+                cursor.execute(f"DROP TABLE IF EXISTS {RETIRED_TABLE}")
+                if _table_exists(cursor, SUMMARY_TABLE):
+                    cursor.execute(
+                        f"RENAME TABLE {SUMMARY_TABLE} TO {RETIRED_TABLE}, {BUILD_TABLE} TO {SUMMARY_TABLE}"
+                    )
+                    cursor.execute(f"DROP TABLE {RETIRED_TABLE}")
+                else:
+                    cursor.execute(f"RENAME TABLE {BUILD_TABLE} TO {SUMMARY_TABLE}")
+                cursor.execute(f"SELECT COUNT(*) FROM {SUMMARY_TABLE}")
+                refreshed = int(cursor.fetchone()[0])
+            else:
+                cursor.execute(
+                    "SELECT DISTINCT app_id FROM REVIEW_TAG WHERE id > %s AND id <= %s",
+                    (int(state[0]), new_high_water),
+                )
+                changed = [int(row[0]) for row in cursor.fetchall()]
+                for start in range(0, len(changed), APP_BATCH):
+                    batch = changed[start:start + APP_BATCH]
+                    placeholders = ','.join(['%s'] * len(batch))
+                    cursor.execute(
+                        f"REPLACE INTO {SUMMARY_TABLE} ({columns}) "
+                        + keyword_summary_sql(categories, where=f"app_id IN ({placeholders})"),
+                        batch,
+                    )
+                refreshed = len(changed)
+
+            cursor.execute(
+                f"REPLACE INTO {STATE_TABLE} (id, high_water, fingerprint) VALUES (1, %s, %s)",
+                (new_high_water, fingerprint),
+            )
+            connection.commit()
+            return refreshed
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (REFRESH_LOCK,))
+            cursor.fetchone()
+    finally:
+        cursor.close()
+
+
+# 앱에서 쓰는 요약 테이블 읽기 전용 핸들 (테이블을 만들거나 고치지 않는다)
+# revalidate 초마다 상태 테이블의 high water mark 와 스키마 지문을 다시 읽고,
+# 지문이 현재 REVIEW_TAG 스키마와 같을 때만 요약 테이블을 사용한다
+class KeywordSummaryStore:
+    def __init__(self, pool, schema, revalidate=60):
+        self._pool = pool
+        self._schema = schema
+        self.revalidate = revalidate
+        self.high_water = None
+        self.fingerprint = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def _is_fresh(self):
+        return self._checked_at is not None and time.monotonic() - self._checked_at < self.revalidate
+
+    def _read_state(self, connection):
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"SELECT high_water, fingerprint FROM {STATE_TABLE} WHERE id = 1")
+            return cursor.fetchone()
+        except Exception:
+            # 갱신 스크립트를 아직 한 번도 실행하지 않아 상태 테이블이 없으면 준비되지 않은 것으로 본다
+            return None
+        finally:
+            cursor.close()
+
+    # 상태 행을 다시 읽을 때가 되었으면 읽는다 (connection 이 있으면 그 커넥션을, 없으면 풀에서 하나 빌려 사용)
+    def sync(self, connection=None):
+        if self._is_fresh():
+            return self
+        with self._lock:
+            if self._is_fresh():
+                return self
+            if connection is not None:
+                state = self._read_state(connection)
+            else:
+                with self._pool.connection() as pooled:
+                    if not pooled:
+                        return self
+                    state = self._read_state(pooled)
+            self.high_water, self.fingerprint = (int(state[0]), state[1]) if state else (None, None)
+            self._checked_at = time.monotonic()
+        return self
+
+    # 요약 테이블이 현재 스키마로 한 번 이상 갱신되었는지
+    def is_ready(self):
+        return self.high_water is not None and self.fingerprint == self._schema.fingerprint
+
+    # app_id 목록의 집계 행 (keyword_summary_columns 순서, app_ids 가 None 이면 모든 app_id), 아직 준비되지 않았으면 None
+    # categories 는 호출하는 쪽이 이미 읽어 둔 목록 (connection 을 잡은 채로 스키마 레지스트리가 커넥션을 또 빌리지 않도록)
+    def read(self, connection, app_ids, categories):
+        if not self.sync(connection).is_ready():
+            return None
+        columns = keyword_summary_columns(categories)
+        if app_ids is not None and not len(app_ids):
+            return pd.DataFrame(columns=columns)
+        cursor = connection.cursor()
+        try:
+            query = f"SELECT {', '.join(columns)} FROM {SUMMARY_TABLE}"
+            if app_ids is None:
+                cursor.execute(query)
+            else:
+                placeholders = ','.join(['%s'] * len(app_ids))
+                cursor.execute(f"{query} WHERE app_id IN ({placeholders})", [int(app_id) for app_id in app_ids])
+            return pd.DataFrame(cursor.fetchall(), columns=columns)
+        finally:
+            cursor.close()
@@ -0,0 +1,54 @@
+import os
+import sys
+
+import mysql.connector
+from dotenv import load_dotenv
+
+from db_pool import ConnectionPool
+from keyword_summary import refresh_keyword_summary
+from review_schema import ReviewSchemaRegistry
+
+# REVIEW_TAG_SUMMARY 갱신 스크립트 (앱 밖에서 cron 등으로 주기 실행, 예: */10 * * * * python refresh_keyword_summary.py)
+# 앱은 요약 테이블을 읽기만 하므로 CREATE / DROP / RENAME 권한은 이 스크립트가 쓰는 DB 계정에만 주면 된다
+# SUMMARY_DB_USER / SUMMARY_DB_PASSWORD 가 없으면 앱과 같은 DB_USER / DB_PASSWORD 로 접속
+
+if os.path.exists(".env"):
+    load_dotenv()
+
+
+def get_db_connection():
+    return mysql.connector.connect(
+        host=os.getenv("DB_HOST"),
+        user=os.getenv("SUMMARY_DB_USER", os.getenv("DB_USER")),
+        password=os.getenv("SUMMARY_DB_PASSWORD", os.getenv("DB_PASSWORD")),
+        database=os.getenv("DB_NAME"),
+        port=int(os.getenv("DB_PORT", 3306)),
+        charset='utf8mb4',
+        collation='utf8mb4_general_ci'
+    )
+
+
+def main():
+    pool = ConnectionPool(get_db_connection, size=1)
+    schema = ReviewSchemaRegistry(pool, revalidate=0)
+    try:
+        # get_categories 도 풀에서 커넥션을 빌리므로 갱신용 커넥션을 잡기 전에 스키마를 먼저 읽는다
+        categories = schema.get_categories()
+        fingerprint = schema.fingerprint
+        with pool.connection() as connection:
+            if not connection:
+                raise ConnectionError("요약 테이블을 갱신할 커넥션이 없습니다.")
+            refreshed = refresh_keyword_summary(connection, categories, fingerprint)
+    except (ConnectionError, mysql.connector.Error) as err:
+        print(f"요약 테이블 갱신 오류: {err}", file=sys.stderr)
+        return 1
+    finally:
+        pool.close()
+    if refreshed is None:
+        print("다른 곳에서 요약 테이블을 갱신 중이라 건너뜁니다.")
+    else:
+        print(f"{refreshed}개 app_id 의 키워드 집계를 갱신했습니다.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+import hashlib
+import threading
+import time
+
+# 카테고리(키워드) 열이 아닌 REVIEW_TAG 열
+NON_CATEGORY_COLUMNS = {"id", "app_id", "review_id", "review_text"}
+
+# GROUP_CONCAT 은 group_concat_max_len (기본 1024 바이트) 에서 잘리므로 열 정의 행을 그대로 읽어 Python 에서 해시한다
+COLUMNS_QUERY = """
+SELECT COLUMN_NAME, COLUMN_TYPE
+FROM information_schema.COLUMNS
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+ORDER BY ORDINAL_POSITION
+"""
+
+
+# REVIEW_TAG 카테고리 열 목록을 프로세스당 한 번 읽어 두는 스키마 레지스트리
+# revalidate 초마다 information_schema 의 열 정의 (이름, 타입) 를 읽어 해시가 바뀌었을 때만 카테고리 목록을 다시 만든다
+class ReviewSchemaRegistry:
+    def __init__(self, pool, table="REVIEW_TAG", revalidate=300):
+        self._pool = pool
+        self.table = table
+        self.revalidate = revalidate
+        self.categories = ()
+        self.fingerprint = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def _is_fresh(self):
+        return self._checked_at is not None and time.monotonic() - self._checked_at < self.revalidate
+
+    # 모든 로더가 같은 순서의 불변 튜플을 받는다
+    def get_categories(self):
+        if self._is_fresh():
+            return self.categories
+        with self._lock:
+            if self._is_fresh():
+                return self.categories
+            with self._pool.connection() as connection:
+                if not connection:
+                    return self.categories
+                cursor = connection.cursor()
+                try:
+                    cursor.execute(COLUMNS_QUERY, (self.table,))
+                    columns = cursor.fetchall()
+                    fingerprint = hashlib.md5(
+                        "\n".join(f"{name}:{column_type}" for name, column_type in columns).encode()
+                    ).hexdigest()
+                    if fingerprint != self.fingerprint or not self.categories:
+                        self.categories = tuple(name for name, _ in columns if name not in NON_CATEGORY_COLUMNS)
+                        self.fingerprint = fingerprint
+                finally:
+                    cursor.close()
+            self._checked_at = time.monotonic()
+        return self.categories
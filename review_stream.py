@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+CHUNK_SIZE = 5000
+
+
+# 한 페이지 값 목록 -> 열 dtype 배열 (숫자 열의 NULL 은 0)
+# 정수 열은 float64 를 거치지 않고 바로 변환 (2**53 을 넘는 BIGINT id 가 반올림되지 않도록)
+def _column_values(values, dtype):
+    if np.issubdtype(dtype, np.integer):
+        return np.array([0 if value is None else value for value in values], dtype=dtype)
+    if np.issubdtype(dtype, np.number):
+        return np.nan_to_num(np.array(values, dtype=np.float64)).astype(dtype)
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+# REVIEW_TAG 에서 where 조건에 맞는 행을 기본 키(id) 순서로 chunk_size 행씩 읽어 미리 할당한 NumPy 열에 채운다
+# - 먼저 COUNT(*) 로 행 수를 알아 열을 한 번에 할당 (읽는 사이 늘어난 행은 배열을 키워서 받음)
+# - 각 페이지는 id > 마지막 id ORDER BY id LIMIT chunk_size 라서 OFFSET 처럼 앞 페이지를 다시 훑지 않고,
+#   한 번에 메모리에 올라오는 결과 행은 chunk_size 개를 넘지 않는다
+# - dtypes 에 없는 열은 object 열
+def read_reviews(connection, columns, where, params=(), dtypes=None, chunk_size=CHUNK_SIZE):
+    dtypes = {"id": np.int64, **(dtypes or {})}
+    columns = ["id", *[col for col in columns if col != "id"]]
+    column_dtypes = [np.dtype(dtypes.get(col, object)) for col in columns]
+    select_cols = ", ".join(columns)
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"SELECT COUNT(*) FROM REVIEW_TAG WHERE {where}", list(params))
+        capacity = int(cursor.fetchone()[0])
+        arrays = [np.empty(capacity, dtype=dtype) for dtype in column_dtypes]
+
+        n, last_id = 0, None
+        while True:
+            if last_id is None:
+                cursor.execute(
+                    f"SELECT {select_cols} FROM REVIEW_TAG WHERE {where} ORDER BY id LIMIT %s",
+                    [*params, chunk_size],
+                )
+            else:
+                cursor.execute(
+                    f"SELECT {select_cols} FROM REVIEW_TAG WHERE ({where}) AND id > %s ORDER BY id LIMIT %s",
+                    [*params, last_id, chunk_size],
+                )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+
+            end = n + len(rows)
+            if end > capacity:
+                capacity = max(end, capacity * 2)
+                arrays = [np.concatenate([array[:n], np.empty(capacity - n, dtype=array.dtype)]) for array in arrays]
+            for array, dtype, values in zip(arrays, column_dtypes, zip(*rows)):
+                array[n:end] = _column_values(values, dtype)
+            n, last_id = end, rows[-1][0]
+            if len(rows) < chunk_size:
+                break
+    finally:
+        cursor.close()
+    return pd.DataFrame({col: array[:n] for col, array in zip(columns, arrays)})
@@ -0,0 +1,145 @@
+import hashlib
+import itertools
+import os
+import threading
+import time
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from keyword_agg import KeywordMatrix
+
+BASE_COLUMNS = ["name", "app_id", "rating", "link"]
+
+
+# Arrow 열 -> NumPy 배열 (한 덩어리이고 null 이 없으면 memory map 버퍼를 그대로 보는 읽기 전용 배열)
+# flatten: 고정 길이 리스트 열이면 값 버퍼 (행 x 리스트 길이) 를 1 차원으로
+def _numpy(column, flatten=False):
+    chunk = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+    if flatten:
+        chunk = chunk.flatten()
+    return chunk.to_numpy(zero_copy_only=chunk.null_count == 0)
+
+
+# 같은 호스트의 모든 워커 프로세스가 함께 쓰는 태그 조합 결과 저장소
+# - 태그 조합 (정렬한 tag_id 튜플) + 데이터 버전마다 Arrow IPC 파일 하나 (/dev/shm 이 있으면 그 아래, 즉 메모리)
+# - 읽을 때는 파일을 memory map 으로 열어 숫자 열 (app_id, 점수, 리뷰 수, 카테고리별 긍정/부정 행렬) 은 복사 없이 NumPy 배열로 본다
+#   (긍정/부정 개수는 타이틀당 고정 길이 리스트 열 하나로 저장해 값 버퍼를 그대로 (타이틀 수, 카테고리 수) 로 reshape)
+# - 이름 / 링크 / 태그 같은 문자열 열은 pandas 객체로 바꾸면서 복사된다
+# - 한 워커가 계산해 저장하면 다른 워커는 DB 를 읽지 않고 같은 파일을 연다
+# - ttl 초가 지난 파일은 없는 것으로 보고, 전체 크기가 max_bytes 를 넘으면 오래된 파일부터 지운다
+class SharedTitleStore:
+    def __init__(self, directory, ttl=3600, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        try:
+            os.makedirs(directory, exist_ok=True)
+            self.available = True
+        except OSError:
+            # 디렉터리를 만들 수 없으면 공유 저장소 없이 동작 (get 은 항상 None, put 은 False)
+            self.available = False
+
+    def _path(self, tag_ids, version):
+        key = ",".join(map(str, sorted(set(int(tid) for tid in tag_ids))))
+        digest = hashlib.md5(f"{version}|{key}".encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.arrow")
+
+    # (타이틀 기본 열 DataFrame, KeywordMatrix), 없거나 만료되었으면 None
+    def get(self, tag_ids, version):
+        if not self.available:
+            return None
+        path = self._path(tag_ids, version)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            table = ipc.open_file(pa.memory_map(path, "r")).read_all()
+        except (OSError, KeyError, pa.ArrowInvalid):
+            return None
+
+        categories = tuple(cat for cat in table.schema.metadata[b"categories"].decode().split(",") if cat)
+        app_ids = _numpy(table.column("app_id"))
+        if categories:
+            pos = _numpy(table.column("pos"), flatten=True).reshape(len(app_ids), len(categories))
+            neg = _numpy(table.column("neg"), flatten=True).reshape(len(app_ids), len(categories))
+        else:
+            pos = neg = np.zeros((len(app_ids), 0), dtype=np.int32)
+        review_count = _numpy(table.column("review_count"))
+        keyword_matrix = KeywordMatrix(app_ids, categories, pos, neg, _numpy(table.column("keyword_score")), review_count > 0, review_count)
+
+        titles = table.select(BASE_COLUMNS).to_pandas()
+        titles["tags"] = table.column("tags").to_pylist()
+        return titles[["name", "app_id", "rating", "tags", "link"]], keyword_matrix
+
+    # tag_ids 의 진부분집합 중 저장된 가장 큰 조합 -> (tag_id 튜플, parts), 없으면 (None, None)
+    def get_largest_subset(self, tag_ids, version, max_probes=64):
+        if not self.available:
+            return None, None
+        tag_ids = sorted(set(int(tid) for tid in tag_ids))
+        probes = 0
+        for size in range(len(tag_ids) - 1, 0, -1):
+            for subset in itertools.combinations(tag_ids, size):
+                if probes >= max_probes:
+                    return None, None
+                probes += 1
+                parts = self.get(subset, version)
+                if parts is not None:
+                    return subset, parts
+        return None, None
+
+    # 저장했으면 True
+    def put(self, tag_ids, version, titles, keyword_matrix):
+        if not self.available:
+            return False
+        path = self._path(tag_ids, version)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            # 예상하지 못한 열 타입 (Decimal 과 float 이 섞인 rating 등) 으로 변환에 실패해도 저장만 건너뛴다
+            columns = {
+                **{name: pa.array(titles[name].tolist()) for name in BASE_COLUMNS},
+                "tags": pa.array([list(tags) if tags is not None else None for tags in titles["tags"]], type=pa.list_(pa.string())),
+                "keyword_score": pa.array(np.asarray(keyword_matrix.score, dtype=np.int64)),
+                "review_count": pa.array(np.asarray(keyword_matrix.review_count, dtype=np.int64)),
+            }
+            n_categories = len(keyword_matrix.categories)
+            for name, counts in (("pos", keyword_matrix.pos), ("neg", keyword_matrix.neg)):
+                if n_categories:
+                    values = pa.array(np.ascontiguousarray(counts, dtype=np.int32).reshape(-1))
+                    columns[name] = pa.FixedSizeListArray.from_arrays(values, n_categories)
+            table = pa.table(columns, metadata={"categories": ",".join(keyword_matrix.categories)})
+
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, path)
+        except (OSError, pa.ArrowException):
+            # 공유 메모리가 가득 차는 등 저장에 실패해도 결과는 이미 계산되어 있으므로 건너뛴다
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+        self.prune()
+        return True
+
+    # 만료된 파일과 크기 한도를 넘는 오래된 파일 정리
+    def prune(self):
+        now = time.time()
+        files = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".arrow"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for mtime, size, path in files:
+            if now - mtime <= self.ttl and total <= self.max_bytes:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
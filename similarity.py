@@ -0,0 +1,485 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+MATRIX_NEIGHBORS = 9
+
+
+# MATRIX 테이블 전체를 담은 이웃 저장소
+# - game_app_ids: 정렬된 기준 게임 id (MATRIX 행 순서)
+# - neighbor_ids: (행 x 9) int64 추천 app_id (없으면 -1)
+# - similarities: (행 x 9) float32 코사인 유사도 (없으면 nan)
+class NeighborStore:
+    def __init__(self, game_app_ids, neighbor_ids, similarities):
+        order = np.argsort(game_app_ids, kind="stable")
+        self.game_app_ids = np.asarray(game_app_ids, dtype=np.int64)[order]
+        self.neighbor_ids = np.asarray(neighbor_ids, dtype=np.int64)[order]
+        self.similarities = np.asarray(similarities, dtype=np.float32)[order]
+
+    def __len__(self):
+        return len(self.game_app_ids)
+
+    # MATRIX 행 (game_app_id, recommended_app_id_1..9, similarity_1..9) 목록으로 생성
+    @classmethod
+    def from_rows(cls, rows, k=MATRIX_NEIGHBORS):
+        values = pd.DataFrame(rows).apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64).reshape(-1, 1 + 2 * k)
+        game_app_ids = values[:, 0]
+        valid = ~np.isnan(game_app_ids)
+        ids = values[valid, 1:1 + k]
+        sims = values[valid, 1 + k:]
+        missing = np.isnan(ids) | np.isnan(sims)
+        return cls(
+            game_app_ids[valid].astype(np.int64),
+            np.where(missing, -1, np.nan_to_num(ids)).astype(np.int64),
+            np.where(missing, np.nan, sims).astype(np.float32),
+        )
+
+    # 여러 게임의 이웃을 한 번에 모아 긴 형식으로 반환 (game_app_id, recommended_app_id, similarity)
+    def lookup_many(self, app_ids):
+        app_ids = np.asarray(app_ids, dtype=np.int64)
+        starts = np.searchsorted(self.game_app_ids, app_ids, side="left")
+        ends = np.searchsorted(self.game_app_ids, app_ids, side="right")
+        lengths = ends - starts
+        rows = np.repeat(starts - np.cumsum(np.r_[0, lengths[:-1]]), lengths) + np.arange(int(lengths.sum()))
+        owners = np.repeat(app_ids, lengths * self.neighbor_ids.shape[1])
+        ids = self.neighbor_ids[rows].ravel()
+        sims = self.similarities[rows].ravel()
+        valid = ids >= 0
+        neighbors = pd.DataFrame({
+            "game_app_id": owners[valid],
+            "recommended_app_id": ids[valid],
+            "similarity": sims[valid],
+        })
+        neighbors = neighbors.sort_values(["game_app_id", "similarity"], ascending=[True, False], kind="stable")
+        return neighbors.drop_duplicates(subset=["game_app_id", "recommended_app_id"], keep="first").reset_index(drop=True)
+
+    # 한 게임의 이웃 (유사도 내림차순, 최대 k 개)
+    def top_k(self, app_id, k=MATRIX_NEIGHBORS):
+        neighbors = self.lookup_many([app_id])
+        return neighbors[["recommended_app_id", "similarity"]].head(k).reset_index(drop=True)
+
+
+# 타이틀 특징(user_tags + 리뷰 키워드 프로필)으로 만든 L2 정규화 벡터에 대한 정확한 코사인 유사도 엔진
+# - 태그 블록: 타이틀이 가진 태그마다 1/sqrt(태그 수) (CSR 로 보관, 희소 행렬 곱으로 계산)
+# - 키워드 블록: 카테고리별 긍정 비율 / 부정 비율을 L2 정규화한 밀집 행렬
+# 두 블록에 가중치를 곱한 뒤 행 전체를 다시 단위 길이로 맞춘다
+class CosineSimilarityEngine:
+    # 배치 질의에서 (질의 수 x 태그 수) 중간 배열이 이 원소 수를 넘지 않도록 나눠서 계산
+    BATCH_ELEMENTS = 1 << 24
+
+    def __init__(self, app_ids, tag_offsets, tag_flat, keyword_matrix, tag_weight=1.0, keyword_weight=1.0):
+        self.app_ids = np.asarray(app_ids, dtype=np.int64)
+        n = len(self.app_ids)
+
+        # 타이틀 안의 중복 태그 제거 후 CSR 재구성
+        counts = np.diff(tag_offsets)
+        owners = np.repeat(np.arange(n, dtype=np.int64), counts)
+        self.n_tags = int(tag_flat.max()) + 1 if len(tag_flat) else 0
+        pairs = np.unique(owners * max(self.n_tags, 1) + tag_flat.astype(np.int64))
+        owners = pairs // max(self.n_tags, 1)
+        self.tag_flat = (pairs % max(self.n_tags, 1)).astype(np.int32)
+        tag_counts = np.bincount(owners, minlength=n)
+        self.tag_offsets = np.concatenate([[0], np.cumsum(tag_counts)])
+
+        review_count = np.maximum(keyword_matrix.review_count, 1)[:, None]
+        keywords = np.hstack([keyword_matrix.pos, keyword_matrix.neg]).astype(np.float32) / review_count
+        keyword_norm = np.linalg.norm(keywords, axis=1)
+        has_keywords = keyword_norm > 0
+        keywords[has_keywords] *= (keyword_weight / keyword_norm[has_keywords])[:, None]
+
+        has_tags = tag_counts > 0
+        row_norm = np.sqrt(has_tags * tag_weight ** 2 + has_keywords * keyword_weight ** 2)
+        row_norm[row_norm == 0] = 1
+        # 태그 블록 값은 행마다 하나의 스칼라 (tag_weight / sqrt(태그 수)), 행 노름까지 나눠 둔다
+        self.tag_value = np.where(has_tags, tag_weight / np.sqrt(np.maximum(tag_counts, 1)), 0).astype(np.float32) / row_norm
+        self.keywords = (keywords / row_norm[:, None]).astype(np.float32)
+
+    def __len__(self):
+        return len(self.app_ids)
+
+    def positions(self, app_ids):
+        app_ids = np.asarray(app_ids, dtype=np.int64)
+        pos = np.searchsorted(self.app_ids, app_ids)
+        found = pos < len(self.app_ids)
+        found[found] = self.app_ids[pos[found]] == app_ids[found]
+        return np.where(found, pos, -1)
+
+    @property
+    def dim(self):
+        return self.n_tags + self.keywords.shape[1]
+
+    # 엔진 입력 데이터 해시 (저장해 둔 근사 색인이 같은 데이터로 만들어졌는지 확인용)
+    def fingerprint(self):
+        digest = hashlib.md5()
+        for array in (self.app_ids, self.tag_offsets, self.tag_flat, self.tag_value, self.keywords):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        return digest.hexdigest()
+
+    # 지정한 행들의 특징 벡터 (행 수 x dim, 단위 길이)
+    def dense_rows(self, rows):
+        rows = np.asarray(rows, dtype=np.int64)
+        vectors = np.zeros((len(rows), self.dim), dtype=np.float32)
+        starts, ends = self.tag_offsets[rows], self.tag_offsets[rows + 1]
+        lengths = ends - starts
+        owners = np.repeat(np.arange(len(rows)), lengths)
+        gather = np.repeat(starts - np.cumsum(np.r_[0, lengths[:-1]]), lengths) + np.arange(int(lengths.sum()))
+        vectors[owners, self.tag_flat[gather]] = np.repeat(self.tag_value[rows], lengths)
+        vectors[:, self.n_tags:] = self.keywords[rows]
+        return vectors
+
+    # 질의 행들의 태그 블록을 (질의 수 x 태그 수) 밀집 배열로
+    def _query_tags(self, rows):
+        queries = np.zeros((len(rows), self.n_tags), dtype=np.float32)
+        for i, row in enumerate(rows):
+            queries[i, self.tag_flat[self.tag_offsets[row]:self.tag_offsets[row + 1]]] = self.tag_value[row]
+        return queries
+
+    # 질의 행들과 전체 타이틀 사이의 코사인 유사도 (질의 수 x 타이틀 수)
+    def scores(self, rows):
+        rows = np.asarray(rows, dtype=np.int64)
+        result = np.zeros((len(rows), len(self)), dtype=np.float32)
+        if not len(self):
+            return result
+        step = max(1, self.BATCH_ELEMENTS // max(len(self.tag_flat), 1))
+        for start in range(0, len(rows), step):
+            batch = rows[start:start + step]
+            # CSR 희소 행렬 곱: 타이틀별 태그 구간을 reduceat 으로 합산 (끝에 0 열을 붙여 빈 구간/마지막 구간 처리)
+            gathered = self._query_tags(batch)[:, self.tag_flat]
+            gathered = np.hstack([gathered, np.zeros((len(batch), 1), dtype=np.float32)])
+            tag_scores = np.add.reduceat(gathered, self.tag_offsets[:-1], axis=1) * self.tag_value
+            result[start:start + len(batch)] = tag_scores + self.keywords[batch] @ self.keywords.T
+        return result
+
+    # 기준 게임과 지정한 게임들 사이의 유사도 (없는 게임은 nan)
+    def similarity_between(self, app_id, other_app_ids):
+        row = self.positions([app_id])[0]
+        others = self.positions(other_app_ids)
+        result = np.full(len(others), np.nan, dtype=np.float32)
+        if row >= 0:
+            found = others >= 0
+            result[found] = self.scores([row])[0, others[found]]
+        return result
+
+    # 여러 게임의 상위 k 이웃을 한 번에 (candidates 를 주면 그 app_id 안에서만 찾음, 예: 태그 필터 결과)
+    def top_k_many(self, app_ids, k=10, candidates=None):
+        app_ids = np.asarray(app_ids, dtype=np.int64)
+        rows = self.positions(app_ids)
+        allowed = np.ones(len(self), dtype=bool)
+        if candidates is not None:
+            allowed[:] = False
+            candidate_rows = self.positions(candidates)
+            allowed[candidate_rows[candidate_rows >= 0]] = True
+
+        frames = []
+        known = rows >= 0
+        if known.any():
+            all_scores = self.scores(rows[known])
+            for app_id, row, scores in zip(app_ids[known], rows[known], all_scores):
+                scores = np.where(allowed, scores, -np.inf)
+                scores[row] = -np.inf
+                count = min(k, int(np.isfinite(scores).sum()))
+                if count <= 0:
+                    continue
+                top = np.argpartition(-scores, count - 1)[:count]
+                top = top[np.argsort(-scores[top], kind="stable")]
+                frames.append(pd.DataFrame({
+                    "game_app_id": app_id,
+                    "recommended_app_id": self.app_ids[top],
+                    "similarity": scores[top],
+                }))
+        if not frames:
+            return pd.DataFrame(columns=["game_app_id", "recommended_app_id", "similarity"])
+        return pd.concat(frames, ignore_index=True)
+
+    def top_k(self, app_id, k=10, candidates=None):
+        neighbors = self.top_k_many([app_id], k=k, candidates=candidates)
+        return neighbors[["recommended_app_id", "similarity"]].reset_index(drop=True)
+
+
+# 코사인 유사도 엔진 위의 IVF(역파일) 근사 최근접 이웃 색인
+# - 구면 k-means 로 만든 n_lists 개 중심에 모든 타이틀을 배정해 두고
+# - 질의 시 가장 가까운 nprobe 개 목록의 타이틀만 정확한 코사인으로 다시 계산한다
+# nprobe 를 키우면 재현율이 오르고 지연 시간도 늘어난다
+class IVFIndex:
+    def __init__(self, engine, centroids, list_offsets, list_rows, nprobe=8, benchmark=None):
+        self.engine = engine
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.list_rows = list_rows
+        self.nprobe = nprobe
+        self.benchmark = benchmark or {}
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    @staticmethod
+    def _normalize(vectors):
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+
+    # 전체 타이틀을 가장 가까운 중심에 배정 (메모리를 아끼려고 chunk 단위로 밀집화)
+    @staticmethod
+    def _assign(engine, centroids, rows, chunk=4096):
+        assignment = np.empty(len(rows), dtype=np.int64)
+        for start in range(0, len(rows), chunk):
+            block = engine.dense_rows(rows[start:start + chunk])
+            assignment[start:start + chunk] = np.argmax(block @ centroids.T, axis=1)
+        return assignment
+
+    @classmethod
+    def build(cls, engine, n_lists=None, nprobe=8, iterations=10, sample_size=20000, seed=0):
+        rng = np.random.default_rng(seed)
+        n = len(engine)
+        n_lists = max(1, min(n, n_lists or int(np.sqrt(n))))
+        sample = rng.choice(n, size=min(n, sample_size), replace=False) if n else np.empty(0, dtype=np.int64)
+        vectors = engine.dense_rows(sample)
+        centroids = vectors[rng.choice(len(sample), size=n_lists, replace=False)] if n else np.zeros((0, engine.dim), dtype=np.float32)
+
+        for _ in range(iterations if n else 0):
+            labels = np.argmax(vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, vectors)
+            empty = np.bincount(labels, minlength=n_lists) == 0
+            # 비어 버린 목록은 임의의 표본으로 다시 시작
+            sums[empty] = vectors[rng.choice(len(sample), size=int(empty.sum()))]
+            centroids = cls._normalize(sums).astype(np.float32)
+
+        rows = np.arange(n, dtype=np.int64)
+        assignment = cls._assign(engine, centroids, rows)
+        order = np.argsort(assignment, kind="stable")
+        list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=n_lists))])
+        return cls(engine, centroids, list_offsets, rows[order], nprobe=nprobe)
+
+    def search_many(self, app_ids, k=10, nprobe=None, candidates=None):
+        engine = self.engine
+        nprobe = max(1, min(nprobe or self.nprobe, self.n_lists))
+        app_ids = np.asarray(app_ids, dtype=np.int64)
+        rows = engine.positions(app_ids)
+        allowed = None
+        if candidates is not None:
+            allowed = np.zeros(len(engine), dtype=bool)
+            candidate_rows = engine.positions(candidates)
+            allowed[candidate_rows[candidate_rows >= 0]] = True
+
+        frames = []
+        known = rows >= 0
+        queries = engine.dense_rows(rows[known])
+        for app_id, row, query in zip(app_ids[known], rows[known], queries):
+            probe = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+            members = np.concatenate([self.list_rows[self.list_offsets[i]:self.list_offsets[i + 1]] for i in probe])
+            members = members[members != row]
+            if allowed is not None:
+                members = members[allowed[members]]
+            if not len(members):
+                continue
+            scores = engine.dense_rows(members) @ query
+            count = min(k, len(members))
+            top = np.argpartition(-scores, count - 1)[:count]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            frames.append(pd.DataFrame({
+                "game_app_id": app_id,
+                "recommended_app_id": engine.app_ids[members[top]],
+                "similarity": scores[top],
+            }))
+        if not frames:
+            return pd.DataFrame(columns=["game_app_id", "recommended_app_id", "similarity"])
+        return pd.concat(frames, ignore_index=True)
+
+    def top_k(self, app_id, k=10, nprobe=None, candidates=None):
+        neighbors = self.search_many([app_id], k=k, nprobe=nprobe, candidates=candidates)
+        return neighbors[["recommended_app_id", "similarity"]].reset_index(drop=True)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp_path,
+            centroids=self.centroids,
+            list_offsets=self.list_offsets,
+            list_rows=self.list_rows,
+            nprobe=self.nprobe,
+            fingerprint=self.engine.fingerprint(),
+            benchmark=np.array([self.benchmark.get(key, np.nan) for key in BENCHMARK_KEYS], dtype=np.float64),
+        )
+        os.replace(tmp_path, path)
+
+    # 저장된 색인이 같은 엔진 데이터로 만들어졌을 때만 불러온다 (아니면 None)
+    @classmethod
+    def load(cls, path, engine):
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as saved:
+            if str(saved["fingerprint"]) != engine.fingerprint():
+                return None
+            benchmark = dict(zip(BENCHMARK_KEYS, saved["benchmark"].tolist()))
+            return cls(engine, saved["centroids"], saved["list_offsets"], saved["list_rows"], int(saved["nprobe"]), benchmark)
+
+
+BENCHMARK_KEYS = ("k", "nprobe", "queries", "recall", "ann_ms", "exact_ms")
+
+
+# 무작위 질의로 근사 검색의 recall@k 와 평균 지연 시간을 정확한 전수 계산과 비교
+def benchmark_recall(index, k=10, n_queries=50, nprobe=None, seed=0):
+    engine = index.engine
+    if not len(engine):
+        return {}
+    rng = np.random.default_rng(seed)
+    app_ids = engine.app_ids[rng.choice(len(engine), size=min(n_queries, len(engine)), replace=False)]
+    hits = total = 0
+    ann_seconds = exact_seconds = 0.0
+    for app_id in app_ids:
+        started = time.perf_counter()
+        approx = index.top_k(app_id, k=k, nprobe=nprobe)
+        ann_seconds += time.perf_counter() - started
+        started = time.perf_counter()
+        exact = engine.top_k(app_id, k=k)
+        exact_seconds += time.perf_counter() - started
+        hits += len(set(approx["recommended_app_id"]) & set(exact["recommended_app_id"]))
+        total += len(exact)
+    return {
+        "k": k,
+        "nprobe": nprobe or index.nprobe,
+        "queries": len(app_ids),
+        "recall": hits / total if total else 1.0,
+        "ann_ms": ann_seconds * 1000 / len(app_ids),
+        "exact_ms": exact_seconds * 1000 / len(app_ids),
+    }
+
+
+# 유사도 엔진을 요청 스레드 밖 (백그라운드 스레드) 에서 만들어 두는 자리
+# build() 는 CosineSimilarityEngine 을 돌려주는 함수, 준비되기 전이나 실패했으면 get() 이 None (timeout 초까지는 기다림)
+class BackgroundEngine:
+    def __init__(self, build):
+        self._build = build
+        self.engine = None
+        self.last_error = None
+        self._done = threading.Event()
+        self._thread = None
+
+    @property
+    def finished(self):
+        return self._done.is_set()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True, name="similarity-engine")
+            self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self.engine = self._build()
+        except Exception as err:
+            self.last_error = err
+        finally:
+            self._done.set()
+
+    def get(self, timeout=0.0):
+        self._done.wait(timeout)
+        return self.engine
+
+
+# 근사 색인을 요청 스레드 밖 (백그라운드 스레드) 에서 준비해 두는 자리
+# - path 에 같은 엔진 데이터로 만든 색인이 있으면 (미리 만들어 둔 파일 포함) 불러오기만 하고, 없으면 만들어 재현율을 측정한 뒤 저장
+# - 준비되기 전, 실패했을 때, 측정해 보니 근사 검색이 전수 계산보다 느릴 때는 get() 이 None (호출하는 쪽은 정확한 계산을 사용)
+class BackgroundIVFIndex:
+    def __init__(self, engine, path, nprobe=8):
+        self.engine = engine
+        self.path = path
+        self.nprobe = nprobe
+        self.index = None
+        self.last_error = None
+        self.finished = False
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True, name="ann-index")
+            self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            index = IVFIndex.load(self.path, self.engine)
+            if index is None:
+                index = IVFIndex.build(self.engine, nprobe=self.nprobe)
+                index.benchmark = benchmark_recall(index)
+                index.save(self.path)
+            index.nprobe = self.nprobe
+            if not index.benchmark.get("ann_ms", 0) >= index.benchmark.get("exact_ms", np.inf):
+                self.index = index
+        except Exception as err:
+            self.last_error = err
+        finally:
+            self.finished = True
+
+    def get(self):
+        return self.index
+
+
+# 현재 태그 선택의 모든 타이틀에 대한 추천 행(SIMILAR_GAMES)을 백그라운드 스레드에서 미리 읽어 두는 저장소
+# load_batch(app_ids) 는 {app_id: [행, ...]} 을 돌려주는 한 번의 IN 쿼리
+# 읽은 지 ttl 초가 지난 행은 없는 것으로 보고 다음 prefetch 때 다시 읽는다 (SIMILAR_GAMES 가 다시 적재되어도 오래 남지 않도록)
+class RecommendationPrefetcher:
+    def __init__(self, load_batch, chunk_size=500, max_entries=20000, ttl=600):
+        self._load_batch = load_batch
+        self.chunk_size = chunk_size
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._results = OrderedDict()  # app_id -> (읽은 시각, [행, ...])
+        self._pending = set()
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recommend-prefetch")
+
+    # 락을 잡은 상태에서 호출
+    def _fresh(self, app_id, now):
+        entry = self._results.get(app_id)
+        return entry is not None and now - entry[0] <= self.ttl
+
+    def prefetch(self, app_ids):
+        now = time.monotonic()
+        with self._cond:
+            new_ids = [int(app_id) for app_id in dict.fromkeys(app_ids) if not self._fresh(int(app_id), now) and int(app_id) not in self._pending]
+            self._pending.update(new_ids)
+        for start in range(0, len(new_ids), self.chunk_size):
+            self._executor.submit(self._run, new_ids[start:start + self.chunk_size])
+        return len(new_ids)
+
+    def _run(self, app_ids):
+        try:
+            rows_by_app = self._load_batch(app_ids)
+        except Exception:
+            rows_by_app = None
+        loaded_at = time.monotonic()
+        with self._cond:
+            for app_id in app_ids:
+                self._pending.discard(app_id)
+                # 실패한 묶음은 저장하지 않아 화면에서 직접 조회하도록 둔다
+                if rows_by_app is not None:
+                    self._results[app_id] = (loaded_at, rows_by_app.get(app_id, []))
+                    self._results.move_to_end(app_id)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+            self._cond.notify_all()
+
+    # 미리 읽은 추천 행 (읽는 중이면 timeout 초까지 기다림, 없으면 None)
+    def get(self, app_id, timeout=0.0):
+        app_id = int(app_id)
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while app_id in self._pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            if not self._fresh(app_id, time.monotonic()):
+                return None
+            return self._results[app_id][1]
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+
+
+# 태그 비트맵 동시 등장 집계로 타이틀 수가 가장 많은 태그 쌍 / 세 쌍 찾기 -> [(tag_id 튜플, 타이틀 수), ...]
+# 가장 흔한 n_seed_tags 개 태그에서 쌍을 넓히고, 상위 쌍에서 세 쌍을 넓힌다
+# (조합의 타이틀 수는 그 부분 조합의 타이틀 수를 넘을 수 없으므로 상위 조합은 흔한 태그 / 상위 쌍에서 나온다)
+def top_tag_combinations(bitmaps, n_pairs=50, n_triples=50, n_seed_tags=100):
+    tag_counts = bitmaps.cooccurrence(bitmaps.full())
+    seeds = sorted(tag_counts, key=lambda tid: (-tag_counts[tid], tid))[:n_seed_tags]
+
+    pairs = {}
+    for a in seeds:
+        for b, count in bitmaps.cooccurrence(bitmaps.bitmap(a)).items():
+            if b != a:
+                pairs[tuple(sorted((a, b)))] = count
+    ranked_pairs = sorted(pairs, key=lambda combo: (-pairs[combo], combo))
+
+    triples = {}
+    for a, b in ranked_pairs[:2 * max(n_pairs, n_triples)]:
+        for c, count in bitmaps.cooccurrence(bitmaps.bitmap(a) & bitmaps.bitmap(b)).items():
+            if c != a and c != b:
+                triples[tuple(sorted((a, b, c)))] = count
+    ranked_triples = sorted(triples, key=lambda combo: (-triples[combo], combo))
+
+    return (
+        [(combo, pairs[combo]) for combo in ranked_pairs[:n_pairs]]
+        + [(combo, triples[combo]) for combo in ranked_triples[:n_triples]]
+    )
+
+
+# 태그 조합 (tag_id 집합) -> fetch_titles_by_tags 결과를 파일 하나씩 저장하는 디스크 저장소
+# version (로더 캐시 버전: 스키마 지문 + 요약 테이블 high water mark) 이 다르거나 ttl 초가 지난 결과는 없는 것으로 본다
+class TagCombinationStore:
+    def __init__(self, directory, ttl=86400):
+        self.directory = directory
+        self.ttl = ttl
+
+    @staticmethod
+    def key(tag_ids):
+        return tuple(sorted(set(int(tid) for tid in tag_ids)))
+
+    def _path(self, key):
+        digest = hashlib.md5(",".join(map(str, key)).encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.pkl")
+
+    def get(self, tag_ids, version):
+        key = self.key(tag_ids)
+        try:
+            with open(self._path(key), "rb") as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        if entry.get("key") != key or entry.get("version") != version or time.time() - entry.get("created_at", 0) > self.ttl:
+            return None
+        return entry["result"]
+
+    def put(self, tag_ids, version, result):
+        key = self.key(tag_ids)
+        path = self._path(key)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"key": key, "version": version, "created_at": time.time(), "result": result}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+
+# 인기 태그 조합 결과를 백그라운드 스레드에서 미리 계산해 저장 (아직 유효한 결과는 건너뜀)
+class TagCombinationWarmer:
+    def __init__(self, store, combinations, compute, version):
+        self.store = store
+        self.combinations = list(combinations)
+        self.compute = compute
+        self.version = version
+        self.warmed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.last_error = None
+        self.finished = False
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            for tag_ids in self.combinations:
+                if self.store.get(tag_ids, self.version) is not None:
+                    self.skipped += 1
+                    continue
+                try:
+                    self.store.put(tag_ids, self.version, self.compute(tag_ids))
+                    self.warmed += 1
+                except Exception as err:
+                    self.failed += 1
+                    self.last_error = err
+        finally:
+            self.finished = True
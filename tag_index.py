@@ -0,0 +1,292 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+TITLE_COLUMNS = ["app_id", "name", "user_tags", "userScore"]
+EMPTY_IDS = np.empty(0, dtype=np.int64)
+
+
+# 정렬된 두 app_id 배열의 교집합 (작은 배열을 큰 배열에서 이진 탐색)
+def intersect_sorted(small, large):
+    if len(small) > len(large):
+        small, large = large, small
+    if not len(small):
+        return EMPTY_IDS
+    pos = np.searchsorted(large, small)
+    found = pos < len(large)
+    found[found] = large[pos[found]] == small[found]
+    return small[found]
+
+
+# 바이트별 1 비트 개수 (popcount 조회표)
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint16)
+
+
+# app_id 순번(0..N-1) 공간 위의 태그별 압축 비트맵 (roaring 방식의 두 가지 컨테이너)
+# - 흔한 태그: packbits 로 묶은 비트 배열 (N/8 바이트)
+# - 드문 태그: 순번 배열 (uint32), 비트 배열보다 작을 때만 사용
+# 선택 결과도 같은 packbits 비트맵으로 표현해 AND/OR/NOT 과 개수 세기를 바이트 연산으로 처리한다
+class TagBitmapIndex:
+    def __init__(self, app_ids, postings):
+        self.app_ids = app_ids
+        self.n = len(app_ids)
+        self.n_bytes = (self.n + 7) // 8
+        self._tail_mask = np.uint8((0xFF << (8 - self.n % 8)) & 0xFF) if self.n % 8 else np.uint8(0xFF)
+
+        dense_ids, dense_rows, sparse_ids, sparse_ords = [], [], [], []
+        for tid, ids in sorted(postings.items()):
+            ords = np.searchsorted(app_ids, ids).astype(np.uint32)
+            if len(ords) * 32 < self.n:
+                sparse_ids.append(tid)
+                sparse_ords.append(ords)
+            else:
+                dense_ids.append(tid)
+                dense_rows.append(self._pack(ords))
+        self.dense_ids = np.asarray(dense_ids, dtype=np.int64)
+        self.dense = np.vstack(dense_rows) if dense_rows else np.zeros((0, self.n_bytes), dtype=np.uint8)
+        self.sparse_ids = np.asarray(sparse_ids, dtype=np.int64)
+        self.sparse_ords = np.concatenate(sparse_ords) if sparse_ords else np.empty(0, dtype=np.uint32)
+        # sparse_ords 의 각 원소가 어느 드문 태그에 속하는지
+        self.sparse_owner = np.repeat(np.arange(len(sparse_ords)), [len(o) for o in sparse_ords])
+        self.sparse_offsets = np.concatenate([[0], np.cumsum([len(o) for o in sparse_ords], dtype=np.int64)])
+        self._dense_row = {tid: i for i, tid in enumerate(dense_ids)}
+        self._sparse_row = {tid: i for i, tid in enumerate(sparse_ids)}
+
+    def _pack(self, ords):
+        bits = np.zeros(self.n, dtype=bool)
+        bits[ords] = True
+        return np.packbits(bits)
+
+    def empty(self):
+        return np.zeros(self.n_bytes, dtype=np.uint8)
+
+    def full(self):
+        return self.invert(self.empty())
+
+    def bitmap(self, tag_id):
+        tid = int(tag_id)
+        if tid in self._dense_row:
+            return self.dense[self._dense_row[tid]]
+        if tid in self._sparse_row:
+            i = self._sparse_row[tid]
+            return self._pack(self.sparse_ords[self.sparse_offsets[i]:self.sparse_offsets[i + 1]])
+        return self.empty()
+
+    def bitmap_of(self, app_ids):
+        app_ids = np.asarray(app_ids, dtype=np.int64)
+        pos = np.searchsorted(self.app_ids, app_ids)
+        found = pos < self.n
+        found[found] = self.app_ids[pos[found]] == app_ids[found]
+        return self._pack(pos[found])
+
+    def invert(self, bitmap):
+        result = np.invert(bitmap)
+        if self.n_bytes:
+            result[-1] &= self._tail_mask
+        return result
+
+    # all_of 를 모두 갖고, any_of 중 하나 이상을 갖고, none_of 는 하나도 없는 타이틀
+    def query(self, all_of=(), any_of=(), none_of=()):
+        result = self.full()
+        for tid in all_of:
+            result &= self.bitmap(tid)
+        if any_of:
+            union = self.empty()
+            for tid in any_of:
+                union |= self.bitmap(tid)
+            result &= union
+        for tid in none_of:
+            result &= self.invert(self.bitmap(tid))
+        return result
+
+    def count(self, bitmap):
+        return int(POPCOUNT[bitmap].sum())
+
+    def app_ids_in(self, bitmap):
+        return self.app_ids[np.flatnonzero(np.unpackbits(bitmap, count=self.n))]
+
+    # 선택된 타이틀 집합 안에서 모든 태그의 등장 횟수를 한 번에 계산 -> {tag_id: count}
+    def cooccurrence(self, bitmap):
+        dense_counts = POPCOUNT[self.dense & bitmap].sum(axis=1, dtype=np.int64)
+        selected = np.unpackbits(bitmap, count=self.n).astype(bool)
+        hits = selected[self.sparse_ords]
+        sparse_counts = np.bincount(self.sparse_owner[hits], minlength=len(self.sparse_ids))
+        tag_ids = np.concatenate([self.dense_ids, self.sparse_ids])
+        counts = np.concatenate([dense_counts, sparse_counts])
+        nonzero = counts > 0
+        return dict(zip(tag_ids[nonzero].tolist(), counts[nonzero].tolist()))
+
+
+# user_tags JSON 문자열 목록 -> tag_id 목록들 (색인을 만들 때 한 번만 파싱)
+def decode_tag_lists(values):
+    decoded = []
+    for value in values:
+        try:
+            tag_ids = json.loads(value) if isinstance(value, str) else value
+            decoded.append([int(tid) for tid in tag_ids])
+        except (TypeError, ValueError):
+            decoded.append([])
+    return decoded
+
+
+# TITLELIST.user_tags 로 만든 타이틀 태그 저장소
+# - CSR 배치: tag_flat[tag_offsets[i]:tag_offsets[i + 1]] 이 i 번째 타이틀(app_id 오름차순)의 tag_id
+# - 역색인: tag_id -> 정렬된 app_id 배열 (JSON_CONTAINS 로 테이블 전체를 훑는 대신 메모리에서 교집합)
+class TagInvertedIndex:
+    def __init__(self, titles):
+        if titles.empty:
+            titles = pd.DataFrame(columns=TITLE_COLUMNS)
+        titles = titles.drop_duplicates(subset=["app_id"]).astype({"app_id": "int64"}).sort_values("app_id")
+        tag_lists = decode_tag_lists(titles["user_tags"].tolist())
+        self.titles = titles.drop(columns=["user_tags"]).set_index("app_id", drop=False)
+        self.app_ids = self.titles.index.to_numpy()
+
+        counts = np.fromiter((len(tags) for tags in tag_lists), dtype=np.int64, count=len(tag_lists))
+        self.tag_offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.tag_flat = np.fromiter((tid for tags in tag_lists for tid in tags), dtype=np.int32, count=int(self.tag_offsets[-1]))
+
+        # (tag_id, 타이틀 순번) 쌍을 정렬해 태그별 app_id 목록을 한 번에 만든다 (타이틀 안의 중복 태그 제거)
+        owners = np.repeat(np.arange(len(self.app_ids)), counts)
+        order = np.lexsort((owners, self.tag_flat))
+        tags_sorted, owners_sorted = self.tag_flat[order], owners[order]
+        keep = np.r_[True, (tags_sorted[1:] != tags_sorted[:-1]) | (owners_sorted[1:] != owners_sorted[:-1])] if len(order) else np.empty(0, dtype=bool)
+        tags_sorted, owners_sorted = tags_sorted[keep], owners_sorted[keep]
+        bounds = np.flatnonzero(np.r_[True, tags_sorted[1:] != tags_sorted[:-1]]) if len(tags_sorted) else np.empty(0, dtype=np.int64)
+        ends = np.r_[bounds[1:], len(tags_sorted)]
+        self.postings = {
+            int(tags_sorted[start]): self.app_ids[owners_sorted[start:end]]
+            for start, end in zip(bounds.tolist(), ends.tolist())
+        }
+        self.bitmaps = TagBitmapIndex(self.app_ids, self.postings)
+
+    def __len__(self):
+        return len(self.app_ids)
+
+    def posting(self, tag_id):
+        return self.postings.get(int(tag_id), EMPTY_IDS)
+
+    # 모든 태그를 가진 app_id (짧은 목록부터 교집합)
+    def app_ids_with_all(self, tag_ids):
+        lists = sorted((self.posting(tid) for tid in set(int(tid) for tid in tag_ids)), key=len)
+        if not lists:
+            return EMPTY_IDS
+        result = lists[0]
+        for other in lists[1:]:
+            if not len(result):
+                break
+            result = intersect_sorted(result, other)
+        return result
+
+    # app_id -> 타이틀 순번 (색인에 없으면 -1)
+    def positions(self, app_ids):
+        app_ids = np.asarray(app_ids, dtype=np.int64)
+        pos = np.searchsorted(self.app_ids, app_ids)
+        found = pos < len(self.app_ids)
+        found[found] = self.app_ids[pos[found]] == app_ids[found]
+        return np.where(found, pos, -1)
+
+    def tag_ids_of(self, app_id):
+        row = self.positions([app_id])[0]
+        if row < 0:
+            return self.tag_flat[:0]
+        return self.tag_flat[self.tag_offsets[row]:self.tag_offsets[row + 1]]
+
+    # app_id 별 태그 이름 목록 (CSR 구간을 한 번에 모아 이름 배열에서 꺼냄, 색인에 없는 app_id 는 None)
+    def tag_lists(self, app_ids, tag_dictionary):
+        rows = self.positions(app_ids)
+        found = rows >= 0
+        starts = np.where(found, self.tag_offsets[rows], 0)
+        lengths = np.where(found, self.tag_offsets[rows + 1] - starts, 0)
+        ends = np.cumsum(lengths)
+        gather = np.repeat(starts - (ends - lengths), lengths) + np.arange(int(ends[-1]) if len(ends) else 0)
+        names = tag_dictionary.names_of(self.tag_flat[gather])
+
+        tag_lists = np.empty(len(rows), dtype=object)
+        for i, (part, is_found) in enumerate(zip(np.split(names, ends[:-1]), found)):
+            tag_lists[i] = part.tolist() if is_found else None
+        return tag_lists
+
+    def rows(self, app_ids):
+        return self.titles.loc[app_ids].reset_index(drop=True)
+
+
+# TAGS 테이블 사전: tag_id 로 바로 인덱싱하는 이름 배열 + 이름 -> tag_id 해시
+class TagDictionary:
+    def __init__(self, rows):
+        rows = [(int(tag_id), tag_name) for tag_id, tag_name in rows]
+        self.tag_names = [tag_name for _, tag_name in rows]
+        size = max((tag_id for tag_id, _ in rows), default=-1) + 1
+        self.names = np.full(size, None, dtype=object)
+        for tag_id, tag_name in rows:
+            self.names[tag_id] = tag_name
+        self.ids_by_name = {tag_name: tag_id for tag_id, tag_name in rows}
+
+    def __len__(self):
+        return len(self.tag_names)
+
+    def name_of(self, tag_id):
+        tag_id = int(tag_id)
+        if 0 <= tag_id < len(self.names) and self.names[tag_id] is not None:
+            return self.names[tag_id]
+        return str(tag_id)
+
+    # tag_id 배열 -> 이름 배열 (사전에 없는 id 는 숫자 문자열)
+    def names_of(self, tag_ids):
+        tag_ids = np.asarray(tag_ids, dtype=np.int64)
+        names = np.full(len(tag_ids), None, dtype=object)
+        known = (tag_ids >= 0) & (tag_ids < len(self.names))
+        names[known] = self.names[tag_ids[known]]
+        missing = np.flatnonzero(names == None)  # noqa: E711 (object 배열 원소 비교)
+        for i in missing:
+            names[i] = str(tag_ids[i])
+        return names
+
+    def ids_of(self, tag_names):
+        return [self.ids_by_name[name] for name in tag_names if name in self.ids_by_name]
+
+
+# 태그 선택의 정규형: 중복을 없앤 tag_id frozenset
+# 선택 순서와 상관없이 같은 조합이면 같은 값 / 해시 / 캐시 키가 된다 (pickle 도 정렬한 튜플로 저장)
+class TagQuery:
+    __slots__ = ("tag_ids",)
+
+    def __init__(self, tag_ids=()):
+        self.tag_ids = frozenset(int(tid) for tid in tag_ids)
+
+    # 태그 이름 목록 -> TagQuery (사전에 없는 이름은 무시)
+    @classmethod
+    def from_names(cls, tag_names, tag_dictionary):
+        return cls(tag_dictionary.ids_of(tag_names))
+
+    def sorted_ids(self):
+        return tuple(sorted(self.tag_ids))
+
+    # 세션 상태 / 위젯 키로 쓰는 문자열
+    def key(self):
+        return "-".join(map(str, self.sorted_ids()))
+
+    def names(self, tag_dictionary):
+        return [tag_dictionary.name_of(tid) for tid in self.sorted_ids()]
+
+    # 이 조합의 타이틀은 subset 조합 타이틀의 부분집합
+    def is_superset_of(self, subset):
+        return self.tag_ids >= subset.tag_ids
+
+    def __iter__(self):
+        return iter(self.sorted_ids())
+
+    def __len__(self):
+        return len(self.tag_ids)
+
+    def __eq__(self, other):
+        return isinstance(other, TagQuery) and self.tag_ids == other.tag_ids
+
+    def __hash__(self):
+        return hash(self.tag_ids)
+
+    def __reduce__(self):
+        return (TagQuery, (self.sorted_ids(),))
+
+    def __repr__(self):
+        return f"TagQuery({list(self.sorted_ids())})"
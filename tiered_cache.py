@@ -0,0 +1,208 @@
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# 저장 형식 / 값 구조가 바뀌면 올린다 (캐시 키에 포함되어 이전 배포가 남긴 항목은 읽지 않음)
+FORMAT_VERSION = 1
+
+
+# 메모리 + SQLite 디스크 2단 캐시 (값은 pickle 바이트로 보관하므로 읽을 때마다 새 객체를 돌려준다)
+# - memory_entries / memory_bytes: 메모리에 둘 최대 항목 수 / 바이트 수 (항목 크기는 pickle 바이트 길이)
+# - policy: 메모리 단 제거 순서, "lru" (가장 오래 안 쓴 항목) 또는 "lfu" (적중 횟수가 가장 적은 항목, 같으면 오래 안 쓴 항목)
+# - disk_bytes: 디스크에 둘 최대 바이트 수 (넘으면 가장 오래 안 쓴 항목부터 disk_bytes 의 90% 까지 삭제)
+# - ttl: 저장 후 이 시간(초)이 지난 항목은 없는 것으로 본다
+# 재시작 / 재배포 후에도 디스크 단에 남은 결과로 바로 응답한다
+class TieredCache:
+    def __init__(self, path, memory_entries=256, memory_bytes=256 * 1024 * 1024, disk_bytes=512 * 1024 * 1024, ttl=86400, policy="lru"):
+        if policy not in ("lru", "lfu"):
+            raise ValueError(f"지원하지 않는 캐시 정책: {policy}")
+        self.path = path
+        self.memory_entries = memory_entries
+        self.memory_bytes = memory_bytes
+        self.policy = policy
+        self.disk_bytes = disk_bytes
+        self.ttl = ttl
+        self._memory = OrderedDict()  # key -> [저장 시각, pickle 바이트, 함수 이름, 적중 횟수]
+        self._resident = {}  # 함수 이름 -> 메모리 단 바이트 수
+        self._resident_total = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "puts": 0,
+            "skipped": 0,
+            "evictions": 0,
+            "corrupt": 0,
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, func TEXT NOT NULL, created_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL, size INTEGER NOT NULL, value BLOB NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)")
+        # 디스크 단 바이트 수 (put 마다 SUM 을 돌리지 않도록 직접 더하고 뺀다, 같은 파일을 쓰는 다른 프로세스 몫은 제거할 때 다시 센다)
+        self._disk_total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+
+    def _forget(self, key):
+        _, blob, func_name, _ = self._memory.pop(key)
+        self._resident[func_name] -= len(blob)
+        self._resident_total -= len(blob)
+
+    # 메모리 단에 넣고 예산을 넘으면 정책에 따라 제거 (락을 잡은 상태에서 호출, 예산보다 큰 값은 디스크 단에만 둔다)
+    def _remember(self, key, created_at, blob, func_name, hits=0):
+        if key in self._memory:
+            self._forget(key)
+        if len(blob) > self.memory_bytes:
+            return
+        self._memory[key] = [created_at, blob, func_name, hits]
+        self._resident[func_name] = self._resident.get(func_name, 0) + len(blob)
+        self._resident_total += len(blob)
+        while len(self._memory) > self.memory_entries or self._resident_total > self.memory_bytes:
+            if self.policy == "lfu":
+                # 방금 넣은 항목은 적중 횟수가 0 이므로 후보에서 뺀다
+                victim = min((k for k in self._memory if k != key), key=lambda k: self._memory[k][3], default=None)
+            else:
+                victim = next(iter(self._memory))
+            if victim is None:
+                break
+            self._forget(victim)
+            self._stats["evictions"] += 1
+
+    # 디스크 단에서 항목 삭제 (락을 잡은 상태에서 호출)
+    def _delete_disk(self, key):
+        row = self._db.execute("SELECT size FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._disk_total -= row[0]
+
+    # 풀 수 없는 값 (코드 변경으로 클래스가 사라졌거나 파일이 깨진 경우) 은 지우고 없는 것으로 본다
+    def _load(self, key, blob):
+        try:
+            return True, pickle.loads(blob)
+        except Exception:
+            with self._lock:
+                if key in self._memory:
+                    self._forget(key)
+                self._delete_disk(key)
+                self._stats["corrupt"] += 1
+                self._stats["misses"] += 1
+            return False, None
+
+    # (찾음 여부, 값)
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[0] <= self.ttl:
+                self._memory.move_to_end(key)
+                entry[3] += 1
+                self._stats["memory_hits"] += 1
+                blob = entry[1]
+            else:
+                if entry is not None:
+                    self._forget(key)
+
+                row = self._db.execute("SELECT created_at, func, value FROM cache WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self._stats["misses"] += 1
+                    return False, None
+                created_at, func_name, blob = row
+                if now - created_at > self.ttl:
+                    self._delete_disk(key)
+                    self._stats["expired"] += 1
+                    self._stats["misses"] += 1
+                    return False, None
+                self._db.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+                self._remember(key, created_at, blob, func_name, hits=1)
+                self._stats["disk_hits"] += 1
+        return self._load(key, blob)
+
+    def put(self, key, func_name, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, blob, func_name)
+            self._delete_disk(key)
+            self._db.execute(
+                "REPLACE INTO cache (key, func, created_at, accessed_at, size, value) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, func_name, now, now, len(blob), sqlite3.Binary(blob)),
+            )
+            self._disk_total += len(blob)
+            self._stats["puts"] += 1
+            if self._disk_total > self.disk_bytes:
+                self._evict_disk()
+
+    # 디스크 단이 disk_bytes 를 넘으면 가장 오래 안 쓴 항목부터 90% 까지 삭제 (락을 잡은 상태에서 호출)
+    # 넘었을 때만 실제 합계를 다시 세고, 여유를 남겨 두어 다음 put 들이 곧바로 다시 제거하지 않게 한다
+    def _evict_disk(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total > self.disk_bytes:
+            target = self.disk_bytes * 0.9
+            removed = []
+            for key, size in self._db.execute("SELECT key, size FROM cache ORDER BY accessed_at"):
+                if total <= target:
+                    break
+                removed.append(key)
+                total -= size
+            self._db.executemany("DELETE FROM cache WHERE key = ?", [(key,) for key in removed])
+            self._stats["evictions"] += len(removed)
+        self._disk_total = total
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._resident.clear()
+            self._resident_total = 0
+            self._db.execute("DELETE FROM cache")
+            self._disk_total = 0
+
+    # 누적 적중 / 실패 카운터와 현재 크기 (함수별 메모리 / 디스크 바이트 포함)
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["memory_entries"] = len(self._memory)
+            snapshot["memory_bytes"] = self._resident_total
+            snapshot["resident_bytes"] = {func_name: size for func_name, size in self._resident.items() if size}
+            disk_by_func = self._db.execute("SELECT func, COUNT(*), SUM(size) FROM cache GROUP BY func").fetchall()
+        snapshot["disk_entries"] = sum(count for _, count, _ in disk_by_func)
+        snapshot["disk_bytes"] = sum(size for _, _, size in disk_by_func)
+        snapshot["disk_bytes_by_func"] = {func_name: size for func_name, _, size in disk_by_func}
+        lookups = snapshot["memory_hits"] + snapshot["disk_hits"] + snapshot["misses"]
+        snapshot["hit_rate"] = (snapshot["memory_hits"] + snapshot["disk_hits"]) / lookups if lookups else 0.0
+        return snapshot
+
+    # 함수 결과 캐시 데코레이터
+    # - 키: FORMAT_VERSION + 함수 이름 + version() (스키마 / 데이터 버전) + pickle 한 인자
+    # - cacheable(결과) 가 거짓인 결과 (조회 실패로 빈 결과 등) 는 저장하지 않는다
+    def cached(self, version=lambda: "", cacheable=lambda result: True):
+        def decorator(func):
+            func_name = f"{func.__module__}.{func.__qualname__}"
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                raw_key = pickle.dumps((FORMAT_VERSION, func_name, version(), args, sorted(kwargs.items())), protocol=pickle.HIGHEST_PROTOCOL)
+                key = hashlib.sha256(raw_key).hexdigest()
+                found, value = self.get(key)
+                if found:
+                    return value
+                value = func(*args, **kwargs)
+                if cacheable(value):
+                    self.put(key, func_name, value)
+                else:
+                    with self._lock:
+                        self._stats["skipped"] += 1
+                return value
+
+            wrapper.cache = self
+            return wrapper
+        return decorator